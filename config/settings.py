@@ -1,89 +1,120 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 
-def load_config():
+# Base directory of the project
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+@lru_cache(maxsize=1)
+def _load_config_cached():
     """
-    Loads and returns the enhanced application configuration with extended timing and MCP support.
+    Reads the configuration from the environment and creates its directories; runs once per process.
     """
-    # Base directory of the project
-    BASE_DIR = Path(__file__).parent.parent
-
     try:
         from dotenv import load_dotenv
         load_dotenv()
     except ImportError:
         pass  # python-dotenv is not required
 
+    env = os.environ
     config = {
         # Gemini API Configuration
-        'GEMINI_API_KEY': os.getenv('GEMINI_API_KEY', ''),
-        'GEMINI_MODEL': os.getenv('GEMINI_MODEL', 'gemini-1.5-flash'),
-        'GEMINI_TEMPERATURE': float(os.getenv('GEMINI_TEMPERATURE', '0.7')),
-        'GEMINI_MAX_TOKENS': int(float(os.getenv('GEMINI_MAX_TOKENS', '2048'))),
+        'GEMINI_API_KEY': env.get('GEMINI_API_KEY', ''),
+        'GEMINI_MODEL': env.get('GEMINI_MODEL', 'gemini-1.5-flash'),
+        'GEMINI_TEMPERATURE': float(env.get('GEMINI_TEMPERATURE', '0.7')),
+        'GEMINI_MAX_TOKENS': int(float(env.get('GEMINI_MAX_TOKENS', '2048'))),
+        'STREAM_RESPONSES': env.get('STREAM_RESPONSES', 'true').lower() == 'true',
 
         # Enhanced Action Timing Configuration
-        'ACTION_TIMEOUT': int(os.getenv('ACTION_TIMEOUT', '60')),  # 60 seconds per action
-        'MAX_EXECUTION_TIME': int(os.getenv('MAX_EXECUTION_TIME', '900')),  # 15 minutes total
-        'ACTION_DELAY': float(os.getenv('ACTION_DELAY', '2.0')),  # Delay between actions
-        'SCREEN_ANALYSIS_DELAY': float(os.getenv('SCREEN_ANALYSIS_DELAY', '3.0')),  # Screen update wait
+        'ACTION_TIMEOUT': int(env.get('ACTION_TIMEOUT', '60')),  # 60 seconds per action
+        'MAX_EXECUTION_TIME': int(env.get('MAX_EXECUTION_TIME', '900')),  # 15 minutes total
+        'ACTION_DELAY': float(env.get('ACTION_DELAY', '2.0')),  # Delay between actions
+        'SCREEN_ANALYSIS_DELAY': float(env.get('SCREEN_ANALYSIS_DELAY', '3.0')),  # Screen update wait
 
         # MCP (Model Context Protocol) Configuration
-        'ENABLE_MCP': os.getenv('ENABLE_MCP', 'true').lower() == 'true',
-        'WORKSPACE_DIR': Path(os.getenv('WORKSPACE_DIR', str(BASE_DIR))),
-        'MCP_TIMEOUT': int(os.getenv('MCP_TIMEOUT', '30')),  # MCP operation timeout
+        'ENABLE_MCP': env.get('ENABLE_MCP', 'true').lower() == 'true',
+        'WORKSPACE_DIR': Path(env.get('WORKSPACE_DIR', str(BASE_DIR))),
+        'MCP_TIMEOUT': int(env.get('MCP_TIMEOUT', '30')),  # MCP operation timeout
 
         # Voice Configuration
-        'VOICE_ENGINE': os.getenv('VOICE_ENGINE', 'pyttsx3'),
-        'TTS_RATE': int(float(os.getenv('TTS_RATE', '200'))),
-        'TTS_VOLUME': float(os.getenv('TTS_VOLUME', '1.0')),
-        'SPEECH_RECOGNITION_ENGINE': os.getenv('SPEECH_RECOGNITION_ENGINE', 'google_cloud'),
-        'GCP_CREDENTIALS_PATH': os.getenv('GCP_CREDENTIALS_PATH', str(BASE_DIR / 'config' / 'swift-seeker-296907-0704a84f33f1.json')),
+        'VOICE_ENGINE': env.get('VOICE_ENGINE', 'pyttsx3'),
+        'TTS_RATE': int(float(env.get('TTS_RATE', '200'))),
+        'TTS_VOLUME': float(env.get('TTS_VOLUME', '1.0')),
+        'SPEECH_RECOGNITION_ENGINE': env.get('SPEECH_RECOGNITION_ENGINE', 'google_cloud'),  # google_cloud or vosk
+        'VOSK_MODEL_PATH': Path(env.get('VOSK_MODEL_PATH', str(BASE_DIR / 'data' / 'models' / 'vosk-model-small-en-us-0.15'))),
+        'USE_CLOUD_STT': env.get('USE_CLOUD_STT', 'true').lower() == 'true',  # Cloud recognition for commands after a bare wake word
+        'GCP_CREDENTIALS_PATH': env.get('GCP_CREDENTIALS_PATH', str(BASE_DIR / 'config' / 'swift-seeker-296907-0704a84f33f1.json')),
 
         # Wake Word Configuration
-        'WAKE_WORD': os.getenv('WAKE_WORD', 'cherry'),
-        'WAKE_WORD_SENSITIVITY': float(os.getenv('WAKE_WORD_SENSITIVITY', '0.5')),
-        'WAKE_WORD_ENABLED': os.getenv('WAKE_WORD_ENABLED', 'true').lower() == 'true',
-        'CONTINUOUS_LISTENING': os.getenv('CONTINUOUS_LISTENING', 'true').lower() == 'true',
+        'WAKE_WORD': env.get('WAKE_WORD', 'cherry'),
+        'WAKE_WORD_SENSITIVITY': float(env.get('WAKE_WORD_SENSITIVITY', '0.5')),
+        'WAKE_WORD_ENABLED': env.get('WAKE_WORD_ENABLED', 'true').lower() == 'true',
+        'CONTINUOUS_LISTENING': env.get('CONTINUOUS_LISTENING', 'true').lower() == 'true',
 
         # GUI Configuration
-        'GUI_THEME': os.getenv('GUI_THEME', 'modern'),
-        'GUI_POSITION': os.getenv('GUI_POSITION', 'center'),
-        'AUTO_HIDE_GUI': os.getenv('AUTO_HIDE_GUI', 'true').lower() == 'true',
+        'GUI_THEME': env.get('GUI_THEME', 'modern'),
+        'GUI_POSITION': env.get('GUI_POSITION', 'center'),
+        'AUTO_HIDE_GUI': env.get('AUTO_HIDE_GUI', 'true').lower() == 'true',
 
         # Memory Configuration
-        'MEMORY_TYPE': os.getenv('MEMORY_TYPE', 'chromadb'),
-        'MEMORY_LIMIT': int(float(os.getenv('MEMORY_LIMIT', '1000'))),
-        'CONTEXT_WINDOW': int(float(os.getenv('CONTEXT_WINDOW', '10'))),
-        'MEMORY_DIR': Path(os.getenv('MEMORY_DIR', str(BASE_DIR / 'data' / 'memory'))),
+        'MEMORY_TYPE': env.get('MEMORY_TYPE', 'chromadb'),
+        'MEMORY_LIMIT': int(float(env.get('MEMORY_LIMIT', '1000'))),
+        'CONTEXT_WINDOW': int(float(env.get('CONTEXT_WINDOW', '10'))),
+        'MEMORY_DIR': Path(env.get('MEMORY_DIR', str(BASE_DIR / 'data' / 'memory'))),
+        'QUANTIZE_EMBEDDINGS': env.get('QUANTIZE_EMBEDDINGS', 'false').lower() == 'true',  # INT8 embedding model on CPU
+        'EMBEDDING_BACKEND': env.get('EMBEDDING_BACKEND', 'torch').lower(),  # 'torch' or 'onnx'
 
         # Desktop Control - Enhanced Mouse Settings
-        'SCREEN_CAPTURE_INTERVAL': float(os.getenv('SCREEN_CAPTURE_INTERVAL', '1.0')),
-        'PYAUTOGUI_FAILSAFE': os.getenv('PYAUTOGUI_FAILSAFE', 'true').lower() == 'true',
-        'MOUSE_MOVEMENT_SPEED': float(os.getenv('MOUSE_MOVEMENT_SPEED', '1.0')),
-        'SMOOTH_MOUSE_MOVEMENT': os.getenv('SMOOTH_MOUSE_MOVEMENT', 'true').lower() == 'true',
-        'MOUSE_CLICK_DELAY': float(os.getenv('MOUSE_CLICK_DELAY', '0.1')),
-        'CURSOR_ACCURACY_THRESHOLD': int(os.getenv('CURSOR_ACCURACY_THRESHOLD', '5')),
+        'SCREEN_CAPTURE_INTERVAL': float(env.get('SCREEN_CAPTURE_INTERVAL', '1.0')),
+        'PYAUTOGUI_FAILSAFE': env.get('PYAUTOGUI_FAILSAFE', 'true').lower() == 'true',
+        'MOUSE_MOVEMENT_SPEED': float(env.get('MOUSE_MOVEMENT_SPEED', '1.0')),
+        'SMOOTH_MOUSE_MOVEMENT': env.get('SMOOTH_MOUSE_MOVEMENT', 'true').lower() == 'true',
+        'MOUSE_CLICK_DELAY': float(env.get('MOUSE_CLICK_DELAY', '0.1')),
+        'USE_OPENCL': env.get('USE_OPENCL', 'true').lower() == 'true',  # OpenCL template matching when available
+        'CURSOR_ACCURACY_THRESHOLD': int(env.get('CURSOR_ACCURACY_THRESHOLD', '5')),
+        'CLIPBOARD_TYPE_THRESHOLD': int(env.get('CLIPBOARD_TYPE_THRESHOLD', '32')),  # Longer text is pasted, not typed
+        'KEY_SEQUENCE_GAP': float(env.get('KEY_SEQUENCE_GAP', '0.02')),  # Seconds between keys in a key sequence
+        'RUN_DIALOG_DELAY': float(env.get('RUN_DIALOG_DELAY', '0.3')),  # Wait for the Start Menu before typing
 
         # Assets and Data
-        'ASSETS_DIR': Path(os.getenv('ASSETS_DIR', str(BASE_DIR / 'data' / 'assets'))),
-        'LOGS_DIR': Path(os.getenv('LOGS_DIR', str(BASE_DIR / 'data' / 'logs'))),
+        'ASSETS_DIR': Path(env.get('ASSETS_DIR', str(BASE_DIR / 'data' / 'assets'))),
+        'LOGS_DIR': Path(env.get('LOGS_DIR', str(BASE_DIR / 'data' / 'logs'))),
+        'CACHE_DIR': Path(env.get('CACHE_DIR', str(BASE_DIR / 'data' / 'cache'))),
 
         # Logging
-        'LOG_LEVEL': os.getenv('LOG_LEVEL', 'INFO'),
-        'LOG_FILE': os.getenv('LOG_FILE', 'data/logs/cherry.log'),
-        'MAX_LOG_FILES': int(float(os.getenv('MAX_LOG_FILES', '5'))),
+        'LOG_LEVEL': env.get('LOG_LEVEL', 'INFO'),
+        'LOG_FILE': env.get('LOG_FILE', 'data/logs/cherry.log'),
+        'MAX_LOG_FILES': int(float(env.get('MAX_LOG_FILES', '5'))),
 
         # Features (true/false)
-        'ENABLE_WEB_SEARCH': os.getenv('ENABLE_WEB_SEARCH', 'true').lower() == 'true',
-        'ENABLE_FILE_OPERATIONS': os.getenv('ENABLE_FILE_OPERATIONS', 'true').lower() == 'true',
-        'ENABLE_SCREEN_ANALYSIS': os.getenv('ENABLE_SCREEN_ANALYSIS', 'true').lower() == 'true',
-        'ENABLE_SYSTEM_CONTROL': os.getenv('ENABLE_SYSTEM_CONTROL', 'true').lower() == 'true',
+        'ENABLE_WEB_SEARCH': env.get('ENABLE_WEB_SEARCH', 'true').lower() == 'true',
+        'BROWSER_FALLBACK': env.get('BROWSER_FALLBACK', 'true').lower() == 'true',  # Render script-only pages with Playwright if installed
+        'ENABLE_FILE_OPERATIONS': env.get('ENABLE_FILE_OPERATIONS', 'true').lower() == 'true',
+        'ENABLE_SCREEN_ANALYSIS': env.get('ENABLE_SCREEN_ANALYSIS', 'true').lower() == 'true',
+        'ENABLE_SYSTEM_CONTROL': env.get('ENABLE_SYSTEM_CONTROL', 'true').lower() == 'true',
     }
 
     # Ensure directories exist
     config['MEMORY_DIR'].mkdir(parents=True, exist_ok=True)
     config['ASSETS_DIR'].mkdir(parents=True, exist_ok=True)
     config['LOGS_DIR'].mkdir(parents=True, exist_ok=True)
+    config['CACHE_DIR'].mkdir(parents=True, exist_ok=True)
     config['WORKSPACE_DIR'].mkdir(parents=True, exist_ok=True)
 
-    return config
\ No newline at end of file
+    return config
+
+
+def load_config():
+    """
+    Loads and returns the enhanced application configuration with extended timing and MCP support.
+    The environment is read once; each caller gets its own shallow copy of the cached dict.
+    """
+    return dict(_load_config_cached())
+
+
+def reload_config():
+    """
+    Clears the cached configuration and loads it again, picking up changes to the environment.
+    """
+    _load_config_cached.cache_clear()
+    return load_config()
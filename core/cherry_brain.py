@@ -6,6 +6,8 @@ Handles natural language understanding, task planning, and execution with MCP su
 import asyncio
 import logging
 import json
+import re
+from collections import deque
 from typing import Callable, Dict, List, Optional, Any
 import time
 import os
@@ -24,6 +26,42 @@ from core.mcp_client import MCPClient
 from utils.file_handler import FileHandler
 from utils.web_scraper import WebScraper
 
+# Extracts the "function(parameters)" part of an action history entry such as
+# "Step 3: click_mouse({'x': 10, 'y': 20}) -> Clicked at (10, 20) (took 1.0s)"
+HISTORY_ACTION_PATTERN = re.compile(r"Step \d+: (.+?) -> ")
+
+ACTION_JSON_DECODER = json.JSONDecoder()
+
+# Static part of the decision prompt; formatted once per brain with its timing settings
+DECISION_PROMPT_HEADER = '''You are an intelligent AI assistant with extended execution time and advanced tool access.
+
+EXECUTION GUIDELINES:
+1. You have up to {action_timeout} seconds per action and {max_execution_time} seconds total
+2. Take time to analyze the screen carefully after each action ({screen_analysis_delay}s delay)
+3. Break complex tasks into smaller, manageable steps
+4. Use MCP tools when available for enhanced capabilities
+5. If unclear about the user's goal, ask for clarification ONCE only
+6. Use 'finish' when the task is complete or if you encounter persistent errors
+
+Standard Functions:
+- open_application(app_name: str) - Opens an application
+- open_website(url: str) - Opens a website
+- search_web(query: str) - Searches the web
+- type_text(text: str) - Types text
+- press_key(key: str, modifier: Optional[str] = None) - Presses keys
+- click_mouse(x: int, y: int) - Clicks at coordinates
+- scroll(x: int, y: int, direction: str, clicks: int) - Scrolls at position
+- drag_mouse(start_x: int, start_y: int, end_x: int, end_y: int) - Drags between points
+- take_screenshot() - Takes a screenshot for analysis
+- speak(text: str) - Speaks to user (use sparingly)
+- wait(seconds: float) - Waits for specified time
+- finish(summary: str) - Completes the task
+
+MCP Functions:
+- mcp_execute(tool: str, arguments: dict) - Execute MCP tool'''
+
+DECISION_PROMPT_FOOTER = '''IMPORTANT: Take your time, analyze the screen thoroughly, and ensure each action moves toward the goal. 
+Respond with clean JSON only: {"function": "function_name", "parameters": {"key": "value"}} '''
 
 class CherryBrain:
     """Enhanced AI brain for Cherry Assistant with MCP integration and extended action time."""
@@ -32,6 +70,8 @@ class CherryBrain:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.gui_callback: Optional[Callable[[str, str], None]] = None
+        # Told 'processing', 'listening' or 'normal' whenever the assistant's state changes
+        self.status_callback: Optional[Callable[[str], None]] = None
 
         # Initialize Gemini
         try:
@@ -50,6 +90,8 @@ class CherryBrain:
             self.desktop_controller = DesktopController(config)
             self.file_handler = FileHandler(config)
             self.web_scraper = WebScraper(config)
+            # Paraphrased web searches reuse results through the memory embedder
+            self.web_scraper.set_query_embedder(self.memory_manager.embed_query)
 
             # Initialize MCP client
             self.mcp_client = MCPClient(config)
@@ -58,7 +100,7 @@ class CherryBrain:
             self.logger.error(f"Failed to initialize components: {e}")
 
         self.is_listening = False
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=2 * config.get('CONTEXT_WINDOW', 10))
 
         # Enhanced loop prevention with extended timing
         self.last_spoken_text = None
@@ -73,28 +115,59 @@ class CherryBrain:
         self.max_execution_time = config.get('MAX_EXECUTION_TIME', 900)  # 15 minutes total
         self.action_delay = config.get('ACTION_DELAY', 0.5)  # Increased delay between actions
         self.screen_analysis_delay = config.get('SCREEN_ANALYSIS_DELAY', 1.0)  # Time for screen updates
+        self.stream_responses = config.get('STREAM_RESPONSES', True)
+
+        # Action announcements still being spoken; referenced here so they aren't garbage collected
+        self._announcement_tasks = set()
+
+        self._decision_prompt_header = DECISION_PROMPT_HEADER.format(
+            action_timeout=self.action_timeout,
+            max_execution_time=self.max_execution_time,
+            screen_analysis_delay=self.screen_analysis_delay,
+        )
 
     def set_gui_callback(self, callback: Callable[[str, str], None]):
         self.gui_callback = callback
 
+    def set_status_callback(self, callback: Callable[[str], None]):
+        self.status_callback = callback
+
+    def _report_status(self, status: str):
+        """Pass a state change to the status callback, never letting it break the caller."""
+        if not self.status_callback:
+            return
+        try:
+            self.status_callback(status)
+        except Exception as e:
+            self.logger.warning(f"Status callback failed: {e}")
+
     async def initialize(self):
         """Initialize all components including MCP with proper error handling."""
         self.logger.info("Initializing Enhanced Cherry Brain with MCP...")
 
-        try:
-            if hasattr(self.memory_manager, 'initialize'):
-                await self.memory_manager.initialize()
-        except Exception as e:
-            self.logger.error(f"Failed to initialize memory manager: {e}")
+        # Subsystems are independent, so overlap their start-up; each one logs
+        # its own failure and the others keep going
+        await asyncio.gather(
+            self._initialize_component('memory_manager', "memory manager"),
+            self._initialize_component('voice_processor', "voice processor"),
+            self._initialize_component('web_scraper', "web scraper"),
+            self._initialize_mcp(),
+        )
+
+        self.logger.info("Enhanced Cherry Brain initialized successfully!")
 
+    async def _initialize_component(self, attribute: str, name: str):
+        """Initialize a single subsystem if it exposes an initialize() coroutine."""
         try:
-            if hasattr(self.voice_processor, 'initialize'):
-                await self.voice_processor.initialize()
+            component = getattr(self, attribute, None)
+            if hasattr(component, 'initialize'):
+                await component.initialize()
         except Exception as e:
-            self.logger.error(f"Failed to initialize voice processor: {e}")
+            self.logger.error(f"Failed to initialize {name}: {e}")
 
+    async def _initialize_mcp(self):
+        """Initialize the MCP client when enabled."""
         try:
-            # Initialize MCP client
             if self.config.get('ENABLE_MCP', True):
                 await self.mcp_client.initialize()
                 if self.mcp_client.is_connected:
@@ -104,8 +177,6 @@ class CherryBrain:
         except Exception as e:
             self.logger.error(f"Failed to initialize MCP client: {e}")
 
-        self.logger.info("Enhanced Cherry Brain initialized successfully!")
-
     def _build_enhanced_decision_prompt(self, goal: str, history: List[str], screen_context: str) -> str:
         """Build enhanced decision prompt with MCP tools and extended timing awareness."""
         recent_history = history[-8:] if len(history) > 8 else history  # More history for better context
@@ -123,32 +194,7 @@ MCP Tools Available:
 {chr(10).join(f"- {tool}: Use mcp_execute with tool='{tool}'" for tool in mcp_tools[:10])}
 '''
 
-        return f'''You are an intelligent AI assistant with extended execution time and advanced tool access.
-
-EXECUTION GUIDELINES:
-1. You have up to {self.action_timeout} seconds per action and {self.max_execution_time} seconds total
-2. Take time to analyze the screen carefully after each action ({self.screen_analysis_delay}s delay)
-3. Break complex tasks into smaller, manageable steps
-4. Use MCP tools when available for enhanced capabilities
-5. If unclear about the user's goal, ask for clarification ONCE only
-6. Use 'finish' when the task is complete or if you encounter persistent errors
-
-Standard Functions:
-- open_application(app_name: str) - Opens an application
-- open_website(url: str) - Opens a website
-- search_web(query: str) - Searches the web
-- type_text(text: str) - Types text
-- press_key(key: str, modifier: Optional[str] = None) - Presses keys
-- click_mouse(x: int, y: int) - Clicks at coordinates
-- scroll(x: int, y: int, direction: str, clicks: int) - Scrolls at position
-- drag_mouse(start_x: int, start_y: int, end_x: int, end_y: int) - Drags between points
-- take_screenshot() - Takes a screenshot for analysis
-- speak(text: str) - Speaks to user (use sparingly)
-- wait(seconds: float) - Waits for specified time
-- finish(summary: str) - Completes the task
-
-MCP Functions:
-- mcp_execute(tool: str, arguments: dict) - Execute MCP tool{mcp_tools_text}
+        return f'''{self._decision_prompt_header}{mcp_tools_text}
 
 User's Goal: "{goal}"
 
@@ -157,8 +203,7 @@ Recent Action History:
 
 Current Screen Analysis: {screen_context[:1000]}...
 
-IMPORTANT: Take your time, analyze the screen thoroughly, and ensure each action moves toward the goal. 
-Respond with clean JSON only: {{"function": "function_name", "parameters": {{"key": "value"}}}} '''
+{DECISION_PROMPT_FOOTER}'''
 
     async def _decide_next_action(self, goal: str, history: List[str]) -> Optional[Dict[str, Any]]:
         """Enhanced decision making with extended timing and MCP awareness."""
@@ -166,7 +211,10 @@ Respond with clean JSON only: {{"function": "function_name", "parameters": {{"ke
 
         # Check if we're stuck in a loop (more lenient with extended timing)
         if len(history) >= 5:
-            recent_actions = [h.split("Action: ")[1].split(",")[0] if "Action: " in h else h for h in history[-5:]]
+            recent_actions = []
+            for entry in history[-5:]:
+                match = HISTORY_ACTION_PATTERN.match(entry)
+                recent_actions.append(match.group(1) if match else entry)
             unique_actions = len(set(recent_actions))
             if unique_actions <= 2 and len(recent_actions) >= 5:
                 self.logger.warning("Detected potential loop, will try different approach")
@@ -180,9 +228,9 @@ Respond with clean JSON only: {{"function": "function_name", "parameters": {{"ke
                 screen_context = "Unable to analyze screen - taking screenshot for analysis"
                 # Try to take a screenshot
                 try:
-                    screenshot_data = await self.vision_system.take_screenshot()
-                    if screenshot_data and screenshot_data.get('path'):
-                        screen_context += f" - Screenshot saved to {screenshot_data['path']}"
+                    screenshot_data = await self.vision_system.take_screenshot(persist=True)
+                    if screenshot_data and screenshot_data.get('filepath'):
+                        screen_context += f" - Screenshot saved to {screenshot_data['filepath']}"
                 except:
                     pass
 
@@ -208,28 +256,25 @@ Respond with clean JSON only: {{"function": "function_name", "parameters": {{"ke
 
         try:
             # Use higher temperature for more creative problem-solving
-            response = await self.model.generate_content_async(
+            action_text = (await self._generate_action_text(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
+                genai.types.GenerationConfig(
                     temperature=0.8,
                     top_k=40,
                     top_p=0.9,
                     max_output_tokens=2048,
                 )
-            )
-            action_text = response.text.strip()
+            )).strip()
             self.logger.info(f"AI decision raw: {action_text}")
 
-            # Extract JSON more robustly
+            # Decode the first JSON object in place, without slicing the reply
             json_start = action_text.find('{')
-            json_end = action_text.rfind('}')
 
-            if json_start != -1 and json_end != -1:
-                json_str = action_text[json_start:json_end+1]
-                action = json.loads(json_str)
+            if json_start != -1:
+                action, _ = ACTION_JSON_DECODER.raw_decode(action_text, json_start)
 
                 # Validate action structure
-                if 'function' not in action:
+                if not isinstance(action, dict) or 'function' not in action:
                     raise ValueError("No function specified in action")
 
                 return action
@@ -241,8 +286,42 @@ Respond with clean JSON only: {{"function": "function_name", "parameters": {{"ke
             self.logger.error(f"Failed to decide next action: {e}")
             return {"function": "finish", "parameters": {"summary": f"I encountered an error in decision making: {str(e)}"}}
 
+    async def _generate_action_text(self, prompt: str, generation_config) -> str:
+        """Get the model's reply, stopping a streamed reply once it holds a complete JSON action."""
+        if not self.stream_responses:
+            response = await self.model.generate_content_async(prompt, generation_config=generation_config)
+            return response.text
+
+        response = await self.model.generate_content_async(
+            prompt, generation_config=generation_config, stream=True
+        )
+        parts = []
+        async for chunk in response:
+            chunk_text = chunk.text
+            parts.append(chunk_text)
+            if '}' not in chunk_text:
+                continue
+            text = ''.join(parts)
+            json_start = text.find('{')
+            if json_start == -1:
+                continue
+            try:
+                ACTION_JSON_DECODER.raw_decode(text, json_start)
+                break  # The action is complete; don't wait for the rest of the reply
+            except ValueError:
+                continue
+        return ''.join(parts)
+
     async def process_input(self, user_input: str, context: Optional[Dict] = None):
         """Process user input with extended timing and MCP support."""
+        self._report_status('processing')
+        try:
+            await self._run_task(user_input, context)
+        finally:
+            self._report_status('listening' if self.is_listening else 'normal')
+
+    async def _run_task(self, user_input: str, context: Optional[Dict]):
+        """Decide and execute actions for one request until it is done or out of time."""
         start_time = time.time()
         self.logger.info(f"Starting enhanced task execution for: {user_input}")
 
@@ -380,12 +459,22 @@ Respond with clean JSON only: {{"function": "function_name", "parameters": {{"ke
         }
 
         if function_name in action_map:
-            if function_name != 'speak':
-                await self.speak(f"Executing {function_name.replace('_', ' ')}")
+            if function_name == 'speak':
+                return await self.speak(**parameters)
+            # Announce in the background; a failing announcement must not fail the action
+            announcement = asyncio.ensure_future(self.speak(f"Executing {function_name.replace('_', ' ')}"))
+            self._announcement_tasks.add(announcement)
+            announcement.add_done_callback(self._announcement_done)
             return await action_map[function_name](**parameters)
         else:
             raise ValueError(f"Unknown function: {function_name}")
 
+    def _announcement_done(self, task: asyncio.Task):
+        """Forget a finished announcement, logging it if it failed."""
+        self._announcement_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.warning(f"Action announcement failed: {task.exception()}")
+
     # Enhanced safe wrapper methods
     async def _safe_open_application(self, app_name: str) -> str:
         try:
@@ -452,9 +541,9 @@ Respond with clean JSON only: {{"function": "function_name", "parameters": {{"ke
 
     async def _safe_take_screenshot(self) -> str:
         try:
-            screenshot_data = await self.vision_system.take_screenshot()
-            if screenshot_data and screenshot_data.get('path'):
-                return f"Screenshot saved to {screenshot_data['path']}"
+            screenshot_data = await self.vision_system.take_screenshot(persist=True)
+            if screenshot_data and screenshot_data.get('filepath'):
+                return f"Screenshot saved to {screenshot_data['filepath']}"
             else:
                 return "Screenshot taken but path not available"
         except Exception as e:
@@ -483,6 +572,7 @@ Respond with clean JSON only: {{"function": "function_name", "parameters": {{"ke
         try:
             self.is_listening = True
             await self.voice_processor.start_listening(self._handle_voice_input)
+            self._report_status('listening')
         except Exception as e:
             self.logger.error(f"Failed to start listening: {e}")
 
@@ -491,6 +581,7 @@ Respond with clean JSON only: {{"function": "function_name", "parameters": {{"ke
         try:
             self.is_listening = False
             await self.voice_processor.stop_listening()
+            self._report_status('normal')
         except Exception as e:
             self.logger.error(f"Failed to stop listening: {e}")
 
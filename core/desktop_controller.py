@@ -5,6 +5,7 @@ Handles mouse, keyboard control and desktop automation
 
 import asyncio
 import logging
+import sys
 import time
 import webbrowser
 from typing import Dict, List, Tuple, Any, Optional
@@ -20,6 +21,22 @@ except ImportError:
     import sys
     sys.exit(1)
 
+try:
+    import pyperclip  # Installed with pyautogui; used to paste long text
+except ImportError:
+    pyperclip = None
+
+from utils.helpers import to_thread
+
+# Smooth mouse moves last SMOOTH_MOVE_STEPS * 10 ms, scaled by MOUSE_MOVEMENT_SPEED
+SMOOTH_MOVE_STEPS = 10
+
+# Seconds the target application gets to read a pasted clipboard before it is restored
+CLIPBOARD_RESTORE_DELAY = 0.2
+
+# Seconds the Start Menu search gets to settle on its top result before Enter
+SEARCH_SETTLE_DELAY = 0.1
+
 class DesktopController:
     """Handles desktop automation and control for Cherry"""
 
@@ -29,7 +46,7 @@ class DesktopController:
 
         # PyAutoGUI settings
         pyautogui.FAILSAFE = config['PYAUTOGUI_FAILSAFE']
-        pyautogui.PAUSE = 0.1  # Small pause between actions
+        pyautogui.PAUSE = 0  # No implicit sleep after every call; pauses are awaited where needed
 
         # Mouse and keyboard controllers
         self.mouse_controller = mouse.Controller()
@@ -38,10 +55,19 @@ class DesktopController:
         # Movement settings
         self.movement_speed = config['MOUSE_MOVEMENT_SPEED']
 
+        # Text longer than this is pasted through the clipboard instead of typed key by key
+        self.clipboard_threshold = config.get('CLIPBOARD_TYPE_THRESHOLD', 32)
+
+        # Gap between keys in press_multiple_keys
+        self.key_sequence_gap = config.get('KEY_SEQUENCE_GAP', 0.02)
+
+        # Seconds the Start Menu gets to open before the app name is typed
+        self.run_dialog_delay = config.get('RUN_DIALOG_DELAY', 0.3)
+
         # Safety limits
         self.max_clicks_per_minute = 60
         self.click_count = 0
-        self.last_reset_time = time.time()
+        self.last_reset_time = time.monotonic()
 
     async def open_website(self, url: str) -> bool:
         """Open a website in the default web browser."""
@@ -60,15 +86,16 @@ class DesktopController:
     async def open_application(self, app_name: str) -> bool:
         """Opens an application by searching in the Start Menu."""
         try:
+            started = time.perf_counter()
             await self.press_key('win')
-            await asyncio.sleep(0.7)
+            await asyncio.sleep(self.run_dialog_delay)
 
             await self.type_text(app_name)
-            await asyncio.sleep(0.7)
+            await asyncio.sleep(SEARCH_SETTLE_DELAY)
 
             await self.press_key('enter')
 
-            self.logger.info(f"Attempted to open application via Start Menu search: {app_name}")
+            self.logger.info(f"Attempted to open application via Start Menu search: {app_name} ({time.perf_counter() - started:.2f}s)")
             return True
         except Exception as e:
             self.logger.error(f"Error opening application {app_name}: {e}")
@@ -77,15 +104,9 @@ class DesktopController:
     async def move_mouse(self, x: int, y: int, smooth: bool = True) -> bool:
         """Move mouse to specified coordinates"""
         try:
-            current_x, current_y = pyautogui.position()
-
             if smooth and self.movement_speed < 1.0:
-                steps = 10
-                for step in range(steps):
-                    intermediate_x = current_x + (x - current_x) * (step + 1) / steps
-                    intermediate_y = current_y + (y - current_y) * (step + 1) / steps
-                    pyautogui.moveTo(intermediate_x, intermediate_y)
-                    await asyncio.sleep(0.01 / self.movement_speed)
+                # One interpolated moveTo instead of ten, each of which paid pyautogui.PAUSE
+                await to_thread(pyautogui.moveTo, x, y, duration=SMOOTH_MOVE_STEPS * 0.01 / self.movement_speed)
             else:
                 pyautogui.moveTo(x, y)
 
@@ -121,7 +142,17 @@ class DesktopController:
         """Type text with specified interval between characters"""
         try:
             clean_text = text.replace('\n', '\n').replace('\t', '\t')
-            pyautogui.typewrite(clean_text, interval=interval)
+            pasted = False
+            if pyperclip is not None and len(clean_text) > self.clipboard_threshold and interval <= 0.05 and clean_text.isprintable():
+                try:
+                    await to_thread(self._paste_text, clean_text)
+                    pasted = True
+                except pyperclip.PyperclipException as e:
+                    # No clipboard backend (e.g. Linux without xclip/xsel/wl-clipboard)
+                    self.logger.warning(f"Clipboard unavailable, typing text instead: {e}")
+            if not pasted:
+                # typewrite sleeps between characters; keep that off the event loop
+                await to_thread(pyautogui.typewrite, clean_text, interval=interval)
             self.logger.info(f"Typed text: {text[:50]}...")
             return True
 
@@ -129,6 +160,26 @@ class DesktopController:
             self.logger.error(f"Error typing text: {e}")
             return False
 
+    def _paste_text(self, text: str):
+        """Insert text with one paste shortcut, then restore the user's clipboard text (blocking)
+
+        pyperclip only reads text: when the clipboard held nothing or non-text content
+        (images, files), paste() returns '' and the pasted text is left on the clipboard
+        rather than overwriting that content with an empty string.
+        """
+        previous = pyperclip.paste()
+        pyperclip.copy(text)
+        try:
+            pyautogui.hotkey('command' if sys.platform == 'darwin' else 'ctrl', 'v')
+            time.sleep(CLIPBOARD_RESTORE_DELAY)
+        finally:
+            if previous:
+                try:
+                    pyperclip.copy(previous)
+                except pyperclip.PyperclipException as e:
+                    # The text was already pasted; don't let the restore trigger a second, typed copy
+                    self.logger.warning(f"Could not restore clipboard: {e}")
+
     async def press_key(self, key: str, modifier: Optional[str] = None) -> bool:
         """Press a key or key combination"""
         try:
@@ -152,7 +203,8 @@ class DesktopController:
         try:
             for key in keys:
                 pyautogui.press(key)
-                await asyncio.sleep(0.1)
+                if self.key_sequence_gap > 0:
+                    await asyncio.sleep(self.key_sequence_gap)
 
             self.logger.info(f"Pressed keys: {', '.join(keys)}")
             return True
@@ -216,7 +268,7 @@ class DesktopController:
 
     def _check_click_safety(self) -> bool:
         """Check if click rate is within safe limits"""
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_reset_time > 60:
             self.click_count = 0
             self.last_reset_time = current_time
@@ -4,10 +4,15 @@ Handles RAG, context management, and conversation memory using vector embeddings
 """
 
 import asyncio
+import hashlib
 import logging
 import json
+import os
 import pickle
-from typing import List, Dict, Any, Optional
+import platform
+import uuid
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Optional, Set
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -21,6 +26,27 @@ except ImportError:
     import sys
     sys.exit(1)
 
+from utils.helpers import to_thread
+
+# Number of recent search results kept to answer repeated queries
+SEARCH_CACHE_SIZE = 256
+
+# Number of query embeddings kept; unlike results these never go stale
+QUERY_EMBEDDING_CACHE_SIZE = 512
+
+# Interactions are written to ChromaDB in batches of MEMORY_FLUSH_SIZE, or
+# MEMORY_FLUSH_DELAY seconds after the last one if the batch is not full
+MEMORY_FLUSH_SIZE = 16
+MEMORY_FLUSH_DELAY = 2.0
+
+# Token limit for the embedding model; longer memories are truncated
+EMBEDDING_MAX_SEQ_LENGTH = 128
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Records moved per get/add/delete round trip when archiving old memories
+ARCHIVE_PAGE_SIZE = 1000
+
 class MemoryManager:
     """Manages long-term and short-term memory for Cherry"""
 
@@ -31,14 +57,29 @@ class MemoryManager:
         # Memory storage
         self.db_path = config['MEMORY_DIR']
         self.client = None
-        self.collection = None
+        self.collection = None  # Recent memories, queried on every search
+        self.archive_collection = None  # Older memories, queried only when recent ones run short
+        self.recent_limit = config.get('MEMORY_LIMIT', 1000)
+        self._archive_task: Optional[asyncio.Task] = None
 
         # Embedding model for semantic search
         self.embedding_model = None
 
         # Short-term memory (recent interactions)
-        self.short_term_memory = []
         self.max_short_term = config['CONTEXT_WINDOW']
+        self.short_term_memory = deque(maxlen=self.max_short_term)
+
+        # Recent search results keyed by query digest, cleared on every write
+        self._search_cache = OrderedDict()
+
+        # Embeddings of recent queries keyed by normalized text
+        self._query_embedding_cache = OrderedDict()
+
+        # Interactions waiting for the next batched long-term write
+        self._pending_memories: List[Dict] = []
+        # Debounce timer (safe to cancel), and the writes it started (never cancelled mid-write)
+        self._flush_timer: Optional[asyncio.Task] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
 
         # Long-term memory metadata
         self.memory_stats = {
@@ -46,37 +87,110 @@ class MemoryManager:
             'total_memories': 0,
             'last_cleanup': None
         }
+        self._stats_dirty = False
 
     async def initialize(self):
         """Initialize the memory system"""
         try:
             self.logger.info("Initializing memory manager...")
 
-            # Initialize ChromaDB
-            self.client = chromadb.PersistentClient(
-                path=str(self.db_path),
-                settings=Settings(anonymized_telemetry=False)
-            )
-
-            # Get or create collection
-            self.collection = self.client.get_or_create_collection(
-                name="cherry_memories",
-                metadata={"description": "Cherry AI Assistant memory storage"}
-            )
-
-            # Initialize embedding model
-            self.logger.info("Loading embedding model...")
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Opening the database and loading the model block for seconds,
+            # so do it off the event loop
+            await to_thread(self._load_backends)
 
             # Load memory stats
             await self._load_memory_stats()
 
+            # Keep the recent collection bounded without delaying startup
+            self._archive_task = asyncio.ensure_future(self.cleanup_old_memories())
+
             self.logger.info(f"Memory manager initialized with {self.memory_stats['total_memories']} stored memories")
 
         except Exception as e:
             self.logger.error(f"Failed to initialize memory manager: {e}")
             raise
 
+    def _load_backends(self):
+        """Open the ChromaDB collection and load the embedding model (blocking)"""
+        # Initialize ChromaDB
+        self.client = chromadb.PersistentClient(
+            path=str(self.db_path),
+            settings=Settings(anonymized_telemetry=False)
+        )
+
+        # Get or create collection
+        self.collection = self.client.get_or_create_collection(
+            name="cherry_memories",
+            metadata={"description": "Cherry AI Assistant memory storage"}
+        )
+        self.archive_collection = self.client.get_or_create_collection(
+            name="cherry_memories_archive",
+            metadata={"description": "Cherry AI Assistant archived memory storage"}
+        )
+
+        # Initialize embedding model
+        self.logger.info("Loading embedding model...")
+        if self.config.get('EMBEDDING_BACKEND', 'torch') == 'onnx':
+            self.embedding_model = self._load_onnx_embedding_model()
+        if self.embedding_model is None:
+            self.embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+            if self.config.get('QUANTIZE_EMBEDDINGS', False):
+                self._quantize_embedding_model()
+        # Memories are short turns; truncating long ones caps encode cost
+        self.embedding_model.max_seq_length = EMBEDDING_MAX_SEQ_LENGTH
+
+    def _load_onnx_embedding_model(self) -> Optional[SentenceTransformer]:
+        """Load the INT8 ONNX Runtime export of the embedding model, creating it on first use (blocking)"""
+        try:
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+
+            quantization = 'arm64' if platform.machine().lower().startswith(('arm', 'aarch64')) else 'avx2'
+            model_dir = self.db_path / 'onnx'
+            file_name = f"onnx/model_qint8_{quantization}.onnx"
+
+            if not (model_dir / file_name).exists():
+                self.logger.info("Exporting quantized ONNX embedding model...")
+                model = SentenceTransformer(EMBEDDING_MODEL_NAME, backend='onnx')
+                model.save(str(model_dir))
+                export_dynamic_quantized_onnx_model(model, quantization, str(model_dir))
+
+            return SentenceTransformer(str(model_dir), backend='onnx', model_kwargs={'file_name': file_name})
+        except Exception as e:
+            self.logger.warning(f"ONNX embedding backend unavailable, using PyTorch: {e}")
+            return None
+
+    def _quantize_embedding_model(self):
+        """Swap the model's Linear layers for dynamic INT8 versions for faster CPU encoding (blocking)"""
+        try:
+            import torch
+
+            torch.backends.quantized.engine = 'qnnpack' if platform.machine().lower().startswith(('arm', 'aarch64')) else 'fbgemm'
+            self.embedding_model = torch.quantization.quantize_dynamic(
+                self.embedding_model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            self.logger.info("Embedding model quantized to INT8")
+        except Exception as e:
+            self.logger.warning(f"Could not quantize embedding model, using full precision: {e}")
+
+    def _encode_sync(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the cached model, sorted by length to minimize padding (blocking)"""
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        # One forward pass for the whole batch; a flush never holds more than MEMORY_FLUSH_SIZE texts
+        vectors = self.embedding_model.encode(
+            [texts[i] for i in order],
+            batch_size=max(len(texts), 1),
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).tolist()
+        embeddings = [None] * len(texts)
+        for position, index in enumerate(order):
+            embeddings[index] = vectors[position]
+        return embeddings
+
+    async def _encode(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts off the event loop"""
+        return await to_thread(self._encode_sync, texts)
+
     async def store_interaction(self, user_input: str, cherry_response: str, context: Optional[Dict] = None):
         """Store a user interaction in both short-term and long-term memory"""
         try:
@@ -90,86 +204,166 @@ class MemoryManager:
                 'context': context or {}
             }
 
-            # Add to short-term memory
+            # Add to short-term memory; the deque drops the oldest once full
             self.short_term_memory.append(interaction)
 
-            # Maintain short-term memory size
-            if len(self.short_term_memory) > self.max_short_term:
-                self.short_term_memory.pop(0)
-
-            # Store in long-term memory (vector database)
+            # Queue for long-term memory (vector database)
             await self._store_in_long_term_memory(interaction)
 
             # Update stats
             self.memory_stats['total_interactions'] += 1
+            self._stats_dirty = True
 
         except Exception as e:
             self.logger.error(f"Error storing interaction: {e}")
 
     async def _store_in_long_term_memory(self, interaction: Dict):
-        """Store interaction in vector database for semantic retrieval"""
+        """Queue interaction for the vector database, flushing when the batch is full"""
+        # Random IDs cannot collide with memories stored in earlier sessions
+        self._pending_memories.append(dict(interaction, id=f"interaction_{uuid.uuid4().hex}"))
+
+        if len(self._pending_memories) >= MEMORY_FLUSH_SIZE:
+            await self._flush_long_term()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """(Re)start the debounce timer that flushes a partial batch"""
+        if self._flush_timer and not self._flush_timer.done():
+            self._flush_timer.cancel()
+        self._flush_timer = asyncio.ensure_future(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        """Start a flush of pending interactions once the conversation goes quiet"""
+        await asyncio.sleep(MEMORY_FLUSH_DELAY)
+        # The write runs as its own task, so restarting the timer can no longer interrupt it
+        task = asyncio.ensure_future(self._flush_long_term())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush_long_term(self):
+        """Write all pending interactions to the vector database in one add() call"""
+        batch, self._pending_memories = self._pending_memories, []
+        if not batch:
+            return
+
         try:
             # Combine user input and response for better context
-            combined_text = f"User: {interaction['user_input']} Cherry: {interaction['cherry_response']}"
-
-            # Generate unique ID
-            interaction_id = f"interaction_{self.memory_stats['total_interactions']}"
+            documents = [f"User: {item['user_input']} Cherry: {item['cherry_response']}" for item in batch]
+            embeddings = await self._encode(documents)
 
             # Add to ChromaDB collection
-            self.collection.add(
-                documents=[combined_text],
+            await to_thread(
+                self.collection.add,
+                embeddings=embeddings,
+                documents=documents,
                 metadatas=[{
-                    'timestamp': interaction['timestamp'],
-                    'user_input': interaction['user_input'],
-                    'cherry_response': interaction['cherry_response'],
-                    'context': json.dumps(interaction['context'])
-                }],
-                ids=[interaction_id]
+                    'timestamp': item['timestamp'],
+                    'user_input': item['user_input'],
+                    'cherry_response': item['cherry_response'],
+                    'context': json.dumps(item['context'], separators=(',', ':'))
+                } for item in batch],
+                ids=[item['id'] for item in batch]
             )
 
-            self.memory_stats['total_memories'] += 1
+            self.memory_stats['total_memories'] += len(batch)
+            self._stats_dirty = True
+            self._search_cache.clear()
 
+        except asyncio.CancelledError:
+            # Keep the batch for the next flush instead of dropping it
+            self._pending_memories[:0] = batch
+            raise
         except Exception as e:
-            self.logger.error(f"Error storing in long-term memory: {e}")
+            self.logger.error(f"Error storing {len(batch)} interactions in long-term memory: {e}")
 
     async def search_memories(self, query: str, limit: int = 5) -> List[str]:
         """Search for relevant memories using semantic similarity"""
         try:
-            if not self.collection or self.memory_stats['total_memories'] == 0:
+            if not self.collection:
                 return []
 
-            # Search in vector database
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=min(limit, self.memory_stats['total_memories'])
-            )
+            cache_key = self._search_cache_key(query, limit)
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                self._search_cache.move_to_end(cache_key)
+                return list(cached)
 
-            # Extract relevant memories
-            relevant_memories = []
+            # Search recent memories, falling back to the archive for the remainder
+            query_embedding = await self._encode_query(query)
+            relevant_memories = self._query_collection(self.collection, query_embedding, limit)
+            if len(relevant_memories) < limit and self.archive_collection:
+                relevant_memories += self._query_collection(
+                    self.archive_collection, query_embedding, limit - len(relevant_memories)
+                )
 
-            if results['documents'] and results['documents'][0]:
-                for doc, metadata in zip(results['documents'][0], results['metadatas'][0]):
-                    # Format memory for context
-                    memory_text = f"Previous interaction: {metadata['user_input']} -> {metadata['cherry_response']}"
-                    relevant_memories.append(memory_text)
+            self._search_cache[cache_key] = relevant_memories
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
 
-            return relevant_memories
+            return list(relevant_memories)
 
         except Exception as e:
             self.logger.error(f"Error searching memories: {e}")
             return []
 
+    def _query_collection(self, collection, query_embedding: List[float], limit: int) -> List[str]:
+        """Nearest stored interactions in one collection, formatted for context"""
+        count = collection.count()
+        if count == 0:
+            return []
+
+        results = collection.query(query_embeddings=[query_embedding], n_results=min(limit, count))
+
+        # Extract relevant memories
+        relevant_memories = []
+
+        if results['documents'] and results['documents'][0]:
+            for doc, metadata in zip(results['documents'][0], results['metadatas'][0]):
+                # Format memory for context
+                memory_text = f"Previous interaction: {metadata['user_input']} -> {metadata['cherry_response']}"
+                relevant_memories.append(memory_text)
+
+        return relevant_memories
+
+    async def embed_query(self, query: str) -> Optional[List[float]]:
+        """Normalized embedding of a query for similarity lookups elsewhere, or None without a model"""
+        if self.embedding_model is None:
+            return None
+        return await self._encode_query(query)
+
+    async def _encode_query(self, query: str) -> List[float]:
+        """Embed a query, reusing the vector for repeated queries"""
+        key = " ".join(query.lower().split())
+        embedding = self._query_embedding_cache.get(key)
+        if embedding is not None:
+            self._query_embedding_cache.move_to_end(key)
+            return embedding
+
+        embedding = (await self._encode([key]))[0]
+        self._query_embedding_cache[key] = embedding
+        if len(self._query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+            self._query_embedding_cache.popitem(last=False)
+        return embedding
+
+    @staticmethod
+    def _search_cache_key(query: str, limit: int) -> str:
+        """Digest of the query with case and whitespace normalized; only queries identical after that share an entry"""
+        normalized = " ".join(query.lower().split())
+        return f"{limit}:{hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()}"
+
     def get_short_term_context(self) -> List[Dict]:
         """Get recent conversation context"""
-        return self.short_term_memory.copy()
+        return list(self.short_term_memory)
 
     async def store_fact(self, key: str, value: Any, category: str = "general"):
         """Store a specific fact or preference"""
         try:
             fact_text = f"Fact - {key}: {value}"
-            fact_id = f"fact_{key}_{datetime.now().timestamp()}"
+            fact_id = f"fact_{uuid.uuid4().hex}"
 
             self.collection.add(
+                embeddings=await self._encode([fact_text]),
                 documents=[fact_text],
                 metadatas=[{
                     'type': 'fact',
@@ -182,6 +376,8 @@ class MemoryManager:
             )
 
             self.memory_stats['total_memories'] += 1
+            self._stats_dirty = True
+            self._search_cache.clear()
 
         except Exception as e:
             self.logger.error(f"Error storing fact: {e}")
@@ -190,7 +386,7 @@ class MemoryManager:
         """Recall a specific fact"""
         try:
             results = self.collection.query(
-                query_texts=[f"Fact - {key}"],
+                query_embeddings=[await self._encode_query(f"Fact - {key}")],
                 n_results=1,
                 where={"type": "fact", "key": key}
             )
@@ -205,44 +401,79 @@ class MemoryManager:
             return None
 
     async def cleanup_old_memories(self, days_to_keep: int = 30):
-        """Clean up old memories to free space"""
+        """Move old interactions out of the recent collection so its index stays small"""
         try:
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
             cutoff_iso = cutoff_date.isoformat()
 
-            # This would require custom implementation with ChromaDB
-            # For now, just log the intent
-            self.logger.info(f"Memory cleanup requested for memories older than {cutoff_date}")
+            moved = await to_thread(self._archive_old_memories, cutoff_iso)
+            if moved:
+                self._search_cache.clear()
+            self.logger.info(f"Archived {moved} memories older than {cutoff_date} or beyond the recent limit")
 
             self.memory_stats['last_cleanup'] = datetime.now().isoformat()
+            self._stats_dirty = True
 
         except Exception as e:
             self.logger.error(f"Error during memory cleanup: {e}")
 
+    def _archive_old_memories(self, cutoff_iso: str) -> int:
+        """Move interactions older than cutoff_iso, then the oldest beyond recent_limit, to the archive (blocking)"""
+        # Only metadata is needed to choose what to move; facts always stay recent
+        interactions = []
+        offset = 0
+        while True:
+            page = self.collection.get(include=['metadatas'], limit=ARCHIVE_PAGE_SIZE, offset=offset)
+            if not page['ids']:
+                break
+            for memory_id, metadata in zip(page['ids'], page['metadatas']):
+                if metadata.get('type') != 'fact':
+                    interactions.append((metadata.get('timestamp', ''), memory_id))
+            offset += len(page['ids'])
+
+        interactions.sort()
+        excess = max(0, len(interactions) - self.recent_limit)
+        to_move = [memory_id for index, (timestamp, memory_id) in enumerate(interactions)
+                   if index < excess or timestamp < cutoff_iso]
+
+        for start in range(0, len(to_move), ARCHIVE_PAGE_SIZE):
+            ids = to_move[start:start + ARCHIVE_PAGE_SIZE]
+            page = self.collection.get(ids=ids, include=['embeddings', 'documents', 'metadatas'])
+            self.archive_collection.add(
+                ids=page['ids'],
+                embeddings=page['embeddings'],
+                documents=page['documents'],
+                metadatas=page['metadatas']
+            )
+            self.collection.delete(ids=page['ids'])
+
+        return len(to_move)
+
     async def _load_memory_stats(self):
         """Load memory statistics"""
         try:
             stats_file = self.config['MEMORY_DIR'] / 'memory_stats.json'
 
+            # Stats are informational only; ids and searches do not depend on them
             if stats_file.exists():
                 with open(stats_file, 'r') as f:
                     self.memory_stats.update(json.load(f))
-            else:
-                # Initialize with collection count
-                if self.collection:
-                    count = self.collection.count()
-                    self.memory_stats['total_memories'] = count
 
         except Exception as e:
             self.logger.warning(f"Could not load memory stats: {e}")
 
     async def _save_memory_stats(self):
-        """Save memory statistics"""
+        """Save memory statistics if they changed, replacing the file atomically"""
+        if not self._stats_dirty:
+            return
+
         try:
             stats_file = self.config['MEMORY_DIR'] / 'memory_stats.json'
 
-            with open(stats_file, 'w') as f:
-                json.dump(self.memory_stats, f, indent=2)
+            tmp_file = stats_file.with_suffix('.json.tmp')
+            tmp_file.write_text(json.dumps(self.memory_stats, separators=(',', ':')))
+            os.replace(tmp_file, stats_file)
+            self._stats_dirty = False
 
         except Exception as e:
             self.logger.error(f"Error saving memory stats: {e}")
@@ -260,6 +491,14 @@ class MemoryManager:
     async def cleanup(self):
         """Cleanup memory manager resources"""
         try:
+            for task in (self._archive_task, self._flush_timer):
+                if task and not task.done():
+                    task.cancel()
+            # Let a write in progress finish, then write whatever is still pending
+            if self._flush_tasks:
+                await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+            await self._flush_long_term()
+
             await self._save_memory_stats()
 
             if self.client:
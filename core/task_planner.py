@@ -34,7 +34,7 @@ Here are the functions the assistant can perform:
 
 User Request: "{user_input}"
 
-Context: {json.dumps(context)}
+Context: {json.dumps(context, separators=(",", ":"))}
 
 Based on the user's request and the available functions, create a JSON array of steps to accomplish the goal. Each step should be an object with `"function"` and `"parameters"`.
 
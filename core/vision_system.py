@@ -4,9 +4,16 @@ Handles screen capture, computer vision, and visual analysis
 """
 
 import asyncio
+import hashlib
+import heapq
 import logging
+import os
+import time
 import cv2
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any, Optional
 from pathlib import Path
 from datetime import datetime
@@ -21,6 +28,54 @@ except ImportError:
     import sys
     sys.exit(1)
 
+try:
+    import mss  # Optional faster, region-aware screen capture
+except ImportError:
+    mss = None
+
+
+# Screenshots wider than this are downscaled once before OCR and CV analysis
+ANALYSIS_MAX_WIDTH = 1024
+
+# Minimum contour area (in screen pixels) for a region to count as a window
+MIN_WINDOW_AREA = 10000
+
+# Template matching runs on Gaussian pyramids of up to this many pyrDown levels,
+# stopping while the template is still at least TEMPLATE_MIN_SIDE pixels; each
+# finer level only re-matches a padded window around the coarser peak
+TEMPLATE_PYRAMID_LEVELS = 3
+TEMPLATE_MIN_SIDE = 8
+TEMPLATE_REFINE_PADDING = 8
+
+# Template match results kept for reuse while the screen thumbnail is unchanged
+MATCH_CACHE_SIZE = 64
+
+# Change detection compares grayscale thumbnails of this size, not full frames
+CHANGE_THUMBNAIL_SIZE = (160, 90)
+
+# Seconds a get_window_info result is reused; the process table rarely changes faster
+WINDOW_INFO_TTL = 1.5
+
+# Executable names (lowercase, without extension) treated as GUI applications by get_window_info
+GUI_APP_NAMES = frozenset({
+    'chrome', 'firefox', 'notepad', 'code', 'explorer',
+    'winword', 'word', 'excel', 'powerpnt', 'powerpoint', 'calculator', 'calculatorapp'
+})
+
+# Frames whose 64-bit difference hashes differ in fewer bits reuse the last analysis
+DHASH_MAX_DISTANCE = 5
+
+@lru_cache(maxsize=32)
+def _load_template_pyramid(template_path: str, mtime: float) -> Optional[Tuple[np.ndarray, ...]]:
+    """Read a template image and its pyrDown levels; mtime is part of the key so edited files are reloaded"""
+    template = cv2.imread(template_path)
+    if template is None:
+        return None
+    levels = [template]
+    while len(levels) <= TEMPLATE_PYRAMID_LEVELS and min(levels[-1].shape[:2]) >= 2 * TEMPLATE_MIN_SIDE:
+        levels.append(cv2.pyrDown(levels[-1]))
+    return tuple(levels)
+
 class VisionSystem:
     """Handles screen capture and visual analysis for Cherry"""
 
@@ -33,46 +88,80 @@ class VisionSystem:
         self.capture_interval = config['SCREEN_CAPTURE_INTERVAL']
 
         # Visual analysis state
-        self.last_screenshot = None
+        self.last_thumb = None  # Grayscale thumbnail of the last full-screen frame, all change detection needs
         self.last_screen_text = None
         self.screen_change_threshold = 0.1
 
-        # Cache for performance
-        self.screenshot_cache = {}
-        self.analysis_cache = {}
+        # Difference hash and analysis of the last analysed frame
+        self._last_dhash = None
+        self._last_analysis = None
+        self._last_region = None
+
+        # Capture and CV work runs here, off the event loop; one worker keeps
+        # OpenCV from competing with itself and serializes the state above
+        self._cv_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cherry-vision")
+        self._sct = None  # mss handle, created on the vision worker thread that uses it
+
+        # Coarse template correlation goes through OpenCV's T-API (OpenCL, often the iGPU) when available
+        self._use_ocl = config.get('USE_OPENCL', True) and cv2.ocl.haveOpenCL()
+        cv2.ocl.setUseOpenCL(self._use_ocl)
 
-    async def take_screenshot(self, region: Optional[Tuple[int, int, int, int]] = None) -> Dict[str, Any]:
-        """Take a screenshot and return image info"""
+        # Independent template matches fan out here from the vision worker
+        self._match_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="cherry-match")
+
+        # (template path, mtime, confidence, screen digest) -> (score, top-left) of recent matches
+        self._match_cache = OrderedDict()
+
+        # (monotonic timestamp, windows) of the last get_window_info call
+        self._window_info_cache = (0.0, [])
+
+    async def _run_cv(self, func, *args):
+        """Run a blocking capture/CV function on the vision worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._cv_executor, func, *args)
+
+    async def take_screenshot(self, region: Optional[Tuple[int, int, int, int]] = None, persist: bool = False) -> Dict[str, Any]:
+        """Take a screenshot and return image info, saving it to disk only when persist is set"""
         try:
-            timestamp = datetime.now().isoformat()
+            return await self._run_cv(self._take_screenshot_sync, region, persist)
+        except Exception as e:
+            self.logger.error(f"Error taking screenshot: {e}")
+            return {'error': str(e)}
 
-            # Take screenshot
-            if region:
-                screenshot = pyautogui.screenshot(region=region)
-            else:
-                screenshot = pyautogui.screenshot()
+    def _take_screenshot_sync(self, region: Optional[Tuple[int, int, int, int]], persist: bool) -> Dict[str, Any]:
+        """Capture, optionally save, and analyze a screenshot (blocking)"""
+        try:
+            timestamp = datetime.now().isoformat()
 
-            # Save screenshot
-            screenshot_dir = self.config['CACHE_DIR'] / 'screenshots'
-            screenshot_dir.mkdir(exist_ok=True)
+            # Take screenshot in OpenCV format for analysis
+            cv_image = self._grab(region)
 
-            filename = f"screenshot_{timestamp.replace(':', '_')}.png"
-            filepath = screenshot_dir / filename
-            screenshot.save(filepath)
+            # Save screenshot with light PNG compression, encoding at the default level is far slower
+            filepath = None
+            if persist:
+                screenshot_dir = self.config['CACHE_DIR'] / 'screenshots'
+                screenshot_dir.mkdir(parents=True, exist_ok=True)
 
-            # Convert to OpenCV format for analysis
-            cv_image = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+                filename = f"screenshot_{timestamp.replace(':', '_')}.png"
+                filepath = screenshot_dir / filename
+                cv2.imwrite(str(filepath), cv_image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
 
             # Store for comparison
-            self.last_screenshot = cv_image
-
-            # Basic image analysis
-            analysis = await self._analyze_screenshot(cv_image)
+            if region is None:
+                self.last_thumb = self._change_thumbnail(cv_image)
+
+            # Basic image analysis, skipped when the screen looks the same as last time
+            dhash = self._dhash(cv_image)
+            if (self._last_analysis is not None and region == self._last_region
+                    and bin(dhash ^ self._last_dhash).count('1') < DHASH_MAX_DISTANCE):
+                analysis = self._last_analysis
+            else:
+                analysis = self._analyze_screenshot(cv_image)
+                self._last_dhash, self._last_analysis, self._last_region = dhash, analysis, region
 
             return {
                 'timestamp': timestamp,
-                'filepath': str(filepath),
-                'dimensions': screenshot.size,
+                'filepath': str(filepath) if filepath else None,
+                'dimensions': (cv_image.shape[1], cv_image.shape[0]),
                 'analysis': analysis,
                 'region': region
             }
@@ -81,17 +170,62 @@ class VisionSystem:
             self.logger.error(f"Error taking screenshot: {e}")
             return {'error': str(e)}
 
-    async def _analyze_screenshot(self, cv_image: np.ndarray) -> Dict[str, Any]:
-        """Analyze screenshot content"""
+    def _grab_thumb(self) -> np.ndarray:
+        """Capture a change-detection thumbnail (blocking)"""
+        frame, is_bgra = self._grab_raw()
+        return self._change_thumbnail(frame, cv2.COLOR_BGRA2GRAY if is_bgra else cv2.COLOR_RGB2GRAY)
+
+    def _grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """Capture the primary screen, or a (left, top, width, height) region of it, as a BGR array (blocking)"""
+        frame, is_bgra = self._grab_raw(region)
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR if is_bgra else cv2.COLOR_RGB2BGR)
+
+    def _grab_raw(self, region: Optional[Tuple[int, int, int, int]] = None) -> Tuple[np.ndarray, bool]:
+        """Capture in the backend's native layout without copying: (BGRA array, True) from mss, (RGB array, False) otherwise (blocking)"""
+        if mss is not None:
+            # mss handles are thread-bound; this only ever runs on the vision worker
+            if self._sct is None:
+                self._sct = mss.mss()
+            if region:
+                left, top, width, height = region
+                monitor = {'left': left, 'top': top, 'width': width, 'height': height}
+            else:
+                monitor = self._sct.monitors[1]
+            raw = self._sct.grab(monitor)
+            return np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4), True
+
+        screenshot = pyautogui.screenshot(region=region) if region else pyautogui.screenshot()
+        return np.asarray(screenshot), False
+
+    @staticmethod
+    def _change_thumbnail(frame: np.ndarray, to_gray: int = cv2.COLOR_BGR2GRAY) -> np.ndarray:
+        """Small grayscale copy of a frame for cheap change detection, shrunk before the color conversion"""
+        return cv2.cvtColor(cv2.resize(frame, CHANGE_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA), to_gray)
+
+    @staticmethod
+    def _dhash(cv_image: np.ndarray) -> int:
+        """64-bit difference hash of a frame: brightness gradients of a 9x8 grayscale thumbnail"""
+        thumbnail = cv2.cvtColor(cv2.resize(cv_image, (9, 8), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        bits = (thumbnail[:, 1:] > thumbnail[:, :-1]).flatten()
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+    def _analyze_screenshot(self, cv_image: np.ndarray) -> Dict[str, Any]:
+        """Analyze screenshot content (blocking)"""
         analysis = {}
 
         try:
-            # Convert back to PIL for OCR
-            pil_image = Image.fromarray(cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB))
+            # Work on a downscaled copy; every stage below scales with pixel count
+            height, width = cv_image.shape[:2]
+            scale = ANALYSIS_MAX_WIDTH / width if width > ANALYSIS_MAX_WIDTH else 1.0
+            if scale < 1.0:
+                cv_image = cv2.resize(cv_image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+            # The grayscale frame is shared by OCR and every stage below
+            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
 
-            # Extract text using OCR
+            # Extract text using OCR (LSTM engine only, single block layout)
             try:
-                extracted_text = pytesseract.image_to_string(pil_image)
+                extracted_text = pytesseract.image_to_string(gray, config='--oem 1 --psm 6')
                 analysis['text_content'] = extracted_text.strip()
                 analysis['has_text'] = bool(extracted_text.strip())
             except Exception as e:
@@ -100,7 +234,7 @@ class VisionSystem:
                 self.logger.warning(f"OCR failed: {e}")
 
             # Color analysis
-            mean_color = cv_image.mean(axis=(0, 1))
+            mean_color = cv2.mean(cv_image)
             analysis['dominant_colors'] = {
                 'blue': int(mean_color[0]),
                 'green': int(mean_color[1]), 
@@ -108,17 +242,16 @@ class VisionSystem:
             }
 
             # Brightness analysis
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
-            analysis['brightness'] = float(gray.mean())
+            analysis['brightness'] = cv2.mean(gray)[0]
             analysis['is_dark'] = analysis['brightness'] < 100
 
-            # Edge detection for activity
+            # Edge detection for activity (edges are 0/255, so this equals their mean)
             edges = cv2.Canny(gray, 50, 150)
-            analysis['edge_density'] = float(edges.mean())
+            analysis['edge_density'] = 255.0 * cv2.countNonZero(edges) / edges.size
             analysis['has_activity'] = analysis['edge_density'] > 10
 
             # Window detection (basic)
-            analysis['potential_windows'] = await self._detect_windows(cv_image)
+            analysis['potential_windows'] = self._detect_windows(gray, scale)
 
         except Exception as e:
             self.logger.error(f"Error in screenshot analysis: {e}")
@@ -126,28 +259,35 @@ class VisionSystem:
 
         return analysis
 
-    async def _detect_windows(self, cv_image: np.ndarray) -> List[Dict]:
-        """Detect potential window areas"""
+    def _detect_windows(self, gray: np.ndarray, scale: float = 1.0) -> List[Dict]:
+        """Detect potential window areas in a grayscale frame, reporting coordinates in screen pixels for an image downscaled by scale"""
         try:
-            gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
+            # findContours expects a binary mask, so split the frame at Otsu's threshold first
+            _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_KCOS)
 
-            # Find contours that might be windows
-            contours, _ = cv2.findContours(gray, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-            windows = []
+            # Bounding-box area is an upper bound on contour area, so it cheaply drops small ones
+            min_area = MIN_WINDOW_AREA * scale * scale
+            candidates = []
             for contour in contours:
+                x, y, w, h = cv2.boundingRect(contour)
+                if w * h <= min_area:
+                    continue
                 area = cv2.contourArea(contour)
-                if area > 10000:  # Filter small areas
-                    x, y, w, h = cv2.boundingRect(contour)
-                    windows.append({
-                        'x': int(x),
-                        'y': int(y), 
-                        'width': int(w),
-                        'height': int(h),
-                        'area': int(area)
-                    })
+                if area > min_area:  # Filter small areas
+                    candidates.append((area, x, y, w, h))
+
+            windows = []
+            for area, x, y, w, h in heapq.nlargest(10, candidates):  # Limit to 10 largest windows
+                windows.append({
+                    'x': int(x / scale),
+                    'y': int(y / scale), 
+                    'width': int(w / scale),
+                    'height': int(h / scale),
+                    'area': int(area / (scale * scale))
+                })
 
-            return windows[:10]  # Limit to 10 largest windows
+            return windows
 
         except Exception as e:
             self.logger.error(f"Error detecting windows: {e}")
@@ -156,7 +296,7 @@ class VisionSystem:
     async def get_screen_context(self) -> Optional[str]:
         """Get textual description of current screen content"""
         try:
-            screenshot_info = await self.take_screenshot()
+            screenshot_info = await self.take_screenshot(persist=False)
 
             if 'analysis' in screenshot_info:
                 analysis = screenshot_info['analysis']
@@ -192,67 +332,169 @@ class VisionSystem:
 
     async def find_image_on_screen(self, template_path: str, confidence: float = 0.8) -> Optional[Dict]:
         """Find an image template on the current screen"""
-        try:
-            # Take current screenshot
-            screenshot = pyautogui.screenshot()
-            screen_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-
-            # Load template image
-            template = cv2.imread(template_path)
-            if template is None:
-                self.logger.error(f"Template image not found: {template_path}")
-                return None
-
-            # Template matching
-            result = cv2.matchTemplate(screen_cv, template, cv2.TM_CCOEFF_NORMED)
-            _, max_val, _, max_loc = cv2.minMaxLoc(result)
-
-            if max_val >= confidence:
-                # Found match
-                h, w = template.shape[:2]
-                center_x = max_loc[0] + w // 2
-                center_y = max_loc[1] + h // 2
-
-                return {
-                    'found': True,
-                    'confidence': float(max_val),
-                    'location': {
-                        'x': center_x,
-                        'y': center_y,
-                        'top_left': max_loc,
-                        'bottom_right': (max_loc[0] + w, max_loc[1] + h)
-                    }
-                }
-            else:
-                return {'found': False, 'confidence': float(max_val)}
+        results = await self.find_images_on_screen([template_path], confidence)
+        return results.get(template_path)
 
+    async def find_images_on_screen(self, template_paths: List[str], confidence: float = 0.8) -> Dict[str, Optional[Dict]]:
+        """Find several image templates in one capture of the current screen, matching them in parallel"""
+        try:
+            return await self._run_cv(self._find_images_on_screen_sync, list(template_paths), confidence)
         except Exception as e:
-            self.logger.error(f"Error finding image on screen: {e}")
-            return None
+            self.logger.error(f"Error finding images on screen: {e}")
+            return {path: None for path in template_paths}
+
+    def _find_images_on_screen_sync(self, template_paths: List[str], confidence: float) -> Dict[str, Optional[Dict]]:
+        """Capture the screen once and template-match every template against it (blocking)"""
+        results = {}
+        pending = {}
+
+        # Take current screenshot
+        screen_cv = self._grab()
+        screen_digest = hashlib.blake2b(self._change_thumbnail(screen_cv).tobytes(), digest_size=8).digest()
+
+        for template_path in template_paths:
+            try:
+                # Load template image
+                mtime = os.path.getmtime(template_path) if os.path.exists(template_path) else None
+                pyramid = _load_template_pyramid(template_path, mtime) if mtime is not None else None
+                if pyramid is None:
+                    self.logger.error(f"Template image not found: {template_path}")
+                    results[template_path] = None
+                    continue
+
+                # Reuse the result when this template was already matched against the same screen
+                cache_key = (template_path, mtime, confidence, screen_digest)
+                cached = self._match_cache.get(cache_key)
+                if cached is not None:
+                    self._match_cache.move_to_end(cache_key)
+                    results[template_path] = self._match_result(*cached, pyramid[0], confidence)
+                else:
+                    pending[template_path] = (pyramid, cache_key)
+            except Exception as e:
+                self.logger.error(f"Error finding image on screen: {e}")
+                results[template_path] = None
+
+        if not pending:
+            return results
+
+        # One screen pyramid serves every template; matchTemplate releases the GIL, so threads scale
+        screens = [screen_cv]
+        for _ in range(max(len(pyramid) for pyramid, _ in pending.values()) - 1):
+            screens.append(cv2.pyrDown(screens[-1]))
+
+        # Upload each screen level a coarse pass runs on once, shared by every template
+        device_screens = {}
+        if self._use_ocl:
+            depths = {len(pyramid) - 1 for pyramid, _ in pending.values()}
+            device_screens = {depth: cv2.UMat(screens[depth]) for depth in depths}
+
+        if len(pending) == 1:
+            futures = {path: None for path in pending}
+        else:
+            futures = {
+                path: self._match_pool.submit(self._match_template, screens, pyramid, confidence, device_screens)
+                for path, (pyramid, _) in pending.items()
+            }
+
+        for template_path, (pyramid, cache_key) in pending.items():
+            try:
+                future = futures[template_path]
+                match = future.result() if future else self._match_template(screens, pyramid, confidence, device_screens)
+                self._match_cache[cache_key] = match
+                if len(self._match_cache) > MATCH_CACHE_SIZE:
+                    self._match_cache.popitem(last=False)
+                results[template_path] = self._match_result(*match, pyramid[0], confidence)
+            except Exception as e:
+                self.logger.error(f"Error finding image on screen: {e}")
+                results[template_path] = None
+
+        return results
+
+    @staticmethod
+    def _match_result(max_val: float, max_loc: Tuple[int, int], template: np.ndarray, confidence: float) -> Dict:
+        """Describe a template match in screen coordinates"""
+        if max_val >= confidence:
+            # Found match
+            h, w = template.shape[:2]
+            center_x = max_loc[0] + w // 2
+            center_y = max_loc[1] + h // 2
+
+            return {
+                'found': True,
+                'confidence': float(max_val),
+                'location': {
+                    'x': center_x,
+                    'y': center_y,
+                    'top_left': max_loc,
+                    'bottom_right': (max_loc[0] + w, max_loc[1] + h)
+                }
+            }
+        else:
+            return {'found': False, 'confidence': float(max_val)}
+
+    @staticmethod
+    def _match_template(screens: List[np.ndarray], pyramid: Tuple[np.ndarray, ...], confidence: float,
+                        device_screens: Optional[Dict[int, Any]] = None) -> Tuple[float, Tuple[int, int]]:
+        """Best TM_CCOEFF_NORMED score and top-left location, matched coarsest level first.
+
+        screens holds the screen and its pyrDown levels, at least as deep as the template pyramid.
+        device_screens maps levels to cv2.UMat copies; the full coarse search runs on those when present,
+        while the small refinement windows stay on the CPU.
+        """
+        depth = len(pyramid) - 1
+
+        if device_screens and depth in device_screens:
+            scores = cv2.matchTemplate(device_screens[depth], cv2.UMat(pyramid[depth]), cv2.TM_CCOEFF_NORMED)
+        else:
+            scores = cv2.matchTemplate(screens[depth], pyramid[depth], cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(scores)
+
+        for level in range(depth - 1, -1, -1):
+            if max_val < confidence * 0.9:
+                # No promising peak; report it in full-resolution coordinates
+                return max_val, (max_loc[0] << (level + 1), max_loc[1] << (level + 1))
+
+            # Refine in a window around the peak projected onto this level
+            h, w = pyramid[level].shape[:2]
+            x0 = max(max_loc[0] * 2 - TEMPLATE_REFINE_PADDING, 0)
+            y0 = max(max_loc[1] * 2 - TEMPLATE_REFINE_PADDING, 0)
+            roi = screens[level][y0:y0 + h + 2 * TEMPLATE_REFINE_PADDING, x0:x0 + w + 2 * TEMPLATE_REFINE_PADDING]
+            _, max_val, _, roi_loc = cv2.minMaxLoc(cv2.matchTemplate(roi, pyramid[level], cv2.TM_CCOEFF_NORMED))
+            max_loc = (x0 + roi_loc[0], y0 + roi_loc[1])
+
+        return max_val, max_loc
 
     async def detect_screen_changes(self) -> bool:
         """Detect if screen has changed significantly"""
         try:
-            current_screenshot = pyautogui.screenshot()
-            current_cv = cv2.cvtColor(np.array(current_screenshot), cv2.COLOR_RGB2BGR)
+            return await self._run_cv(self._detect_screen_changes_sync)
+        except Exception as e:
+            self.logger.error(f"Error detecting screen changes: {e}")
+            return False
 
-            if self.last_screenshot is not None:
-                # Calculate difference
-                diff = cv2.absdiff(self.last_screenshot, current_cv)
-                diff_percentage = diff.mean() / 255.0
+    def _detect_screen_changes_sync(self) -> bool:
+        """Capture the screen and compare it with the last frame (blocking)"""
+        try:
+            # Always a fresh frame, so a change is reported on the poll that sees it
+            small = self._grab_thumb()
+
+            if self.last_thumb is not None:
+                # Calculate difference as a single L1 pass, without a diff image
+                diff_percentage = cv2.norm(self.last_thumb, small, cv2.NORM_L1) / (small.size * 255.0)
 
                 has_changed = diff_percentage > self.screen_change_threshold
 
                 if has_changed:
                     self.logger.info(f"Screen change detected: {diff_percentage:.3f}")
+                    self._match_cache.clear()  # Entries for the old screen can no longer hit
 
                 # Update last screenshot
-                self.last_screenshot = current_cv
+                self.last_thumb = small
 
                 return has_changed
             else:
                 # First screenshot
-                self.last_screenshot = current_cv
+                self.last_thumb = small
                 return True
 
         except Exception as e:
@@ -261,30 +503,30 @@ class VisionSystem:
 
     async def get_window_info(self) -> List[Dict]:
         """Get information about currently open windows"""
+        cached_at, cached_windows = self._window_info_cache
+        now = time.monotonic()
+        if now - cached_at < WINDOW_INFO_TTL:
+            return list(cached_windows)
+
         try:
             import psutil
 
             windows = []
 
-            # Get running processes with windows (simplified)
+            # Get running processes with windows (simplified); process_iter prefetches the attrs into proc.info
             for proc in psutil.process_iter(['pid', 'name']):
-                try:
-                    proc_info = proc.as_dict(attrs=['pid', 'name'])
-
-                    # Filter common GUI applications
-                    gui_apps = ['chrome', 'firefox', 'notepad', 'code', 'explorer', 
-                               'word', 'excel', 'powerpoint', 'calculator']
-
-                    if any(app in proc_info['name'].lower() for app in gui_apps):
-                        windows.append({
-                            'name': proc_info['name'],
-                            'pid': proc_info['pid']
-                        })
-
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
+                # Filter common GUI applications
+                name = proc.info['name'] or ''
+                if os.path.splitext(name)[0].lower() in GUI_APP_NAMES:
+                    windows.append({
+                        'name': name,
+                        'pid': proc.info['pid']
+                    })
+                    if len(windows) == 20:  # Limit results
+                        break
 
-            return windows[:20]  # Limit results
+            self._window_info_cache = (now, windows)
+            return list(windows)
 
         except Exception as e:
             self.logger.error(f"Error getting window info: {e}")
@@ -307,8 +549,9 @@ class VisionSystem:
         """Cleanup vision system resources"""
         try:
             # Clear caches
-            self.screenshot_cache.clear()
-            self.analysis_cache.clear()
+            self._match_cache.clear()
+            self._cv_executor.shutdown(wait=False)
+            self._match_pool.shutdown(wait=False)
 
             self.logger.info("Vision system cleanup completed")
 
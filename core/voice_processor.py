@@ -4,11 +4,13 @@ Handles speech recognition, text-to-speech, and wake word detection
 """
 
 import asyncio
+import json
 import logging
 import threading
 import queue
 import time
 import os
+import re
 from typing import Callable, Optional, Any, Dict
 from io import BytesIO
 
@@ -23,6 +25,13 @@ except ImportError:
     import sys
     sys.exit(1)
 
+try:
+    import vosk  # Optional offline speech recognition
+except ImportError:
+    vosk = None
+
+from utils.helpers import to_thread
+
 class VoiceProcessor:
     """Handles all voice-related functionality for Cherry"""
 
@@ -36,16 +45,25 @@ class VoiceProcessor:
         self.voice_callback = None
         self.stop_background_listening = None
         self.is_active = False
+        self.vosk_model = None
+
+        # Utterances waiting for the speech worker, which plays them one at a time
+        self._speech_queue = None
+        self._speech_worker_task = None
+
+        # Wake word as a whole word, optionally preceded by a greeting, compiled once
+        wake_word = re.escape(config.get('WAKE_WORD', 'cherry').lower())
+        self._wake_pattern = re.compile(rf"\b(?:(?:hey|hi|hello|ok) )?{wake_word}\b")
 
     async def initialize(self):
         """Initialize voice processing components"""
         try:
             self.logger.info("Initializing voice processor...")
             self.event_loop = asyncio.get_running_loop()
-            self.microphone = sr.Microphone()
-            self.logger.info("Calibrating microphone for ambient noise...")
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            # Calibration records for a full second; keep it off the event loop
+            await to_thread(self._calibrate_microphone)
+            if self.config.get('SPEECH_RECOGNITION_ENGINE') == 'vosk':
+                await to_thread(self._load_vosk_model)
 
             mixer.init()
             await self.speak("Cherry voice system initialized")
@@ -53,6 +71,26 @@ class VoiceProcessor:
         except Exception as e:
             self.logger.error(f"Failed to initialize voice processor: {e}")
 
+    def _calibrate_microphone(self):
+        """Open the microphone and calibrate for ambient noise (blocking)"""
+        self.microphone = sr.Microphone()
+        self.logger.info("Calibrating microphone for ambient noise...")
+        with self.microphone as source:
+            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+
+    def _load_vosk_model(self):
+        """Load the offline Vosk model, leaving cloud recognition in place if unavailable (blocking)"""
+        model_path = self.config.get('VOSK_MODEL_PATH')
+        if vosk is None:
+            self.logger.warning("Vosk not installed; using cloud speech recognition. Install with: pip install vosk")
+            return
+        if not model_path or not os.path.isdir(model_path):
+            self.logger.warning(f"Vosk model not found at {model_path}; using cloud speech recognition")
+            return
+        vosk.SetLogLevel(-1)
+        self.vosk_model = vosk.Model(str(model_path))
+        self.logger.info(f"Loaded offline speech model from {model_path}")
+
     async def start_listening(self, voice_callback: Callable[[str], None]):
         """Start continuous voice listening in the background."""
         if self.is_listening or not self.microphone:
@@ -85,12 +123,12 @@ class VoiceProcessor:
         if not self.is_listening:
             return
 
-        wake_word = self.config.get('WAKE_WORD', 'cherry').lower()
         wake_word_enabled = self.config.get('WAKE_WORD_ENABLED', True)
         use_google_cloud = self._can_use_google_cloud()
         
         try:
-            text = self._recognize_audio(audio, use_google_cloud)
+            # Commands following a bare wake word may go to the cloud for accuracy
+            text = self._recognize_audio(audio, use_google_cloud, prefer_cloud=self.is_active)
             if not text:
                 return
 
@@ -108,8 +146,9 @@ class VoiceProcessor:
                     asyncio.run_coroutine_threadsafe(self.voice_callback(text), self.event_loop)
                 return
 
-            if wake_word in text:
-                command_text = text.split(wake_word, 1)[-1].strip()
+            wake_match = self._wake_pattern.search(text)
+            if wake_match:
+                command_text = text[wake_match.end():].strip(" ,.!?")
                 
                 if command_text:
                     self.logger.info(f"Processing command: '{command_text}'")
@@ -125,8 +164,10 @@ class VoiceProcessor:
             self.logger.error(f"Error in background listener callback: {e}")
             self.is_active = False
 
-    def _recognize_audio(self, audio_data: sr.AudioData, use_google_cloud: bool) -> Optional[str]:
+    def _recognize_audio(self, audio_data: sr.AudioData, use_google_cloud: bool, prefer_cloud: bool = False) -> Optional[str]:
         """Recognizes audio using the configured speech recognition engine."""
+        if self.vosk_model and not (prefer_cloud and self.config.get('USE_CLOUD_STT', True)):
+            return self._recognize_offline(audio_data)
         try:
             if use_google_cloud:
                 return self.recognizer.recognize_google_cloud(audio_data).lower()
@@ -140,33 +181,72 @@ class VoiceProcessor:
             asyncio.run_coroutine_threadsafe(self.speak("Sorry, I'm having trouble connecting to the speech service."), self.event_loop)
             return None
 
+    def _recognize_offline(self, audio_data: sr.AudioData) -> Optional[str]:
+        """Recognize audio in-process with Vosk, avoiding a network round trip."""
+        recognizer = vosk.KaldiRecognizer(self.vosk_model, 16000)
+        recognizer.AcceptWaveform(audio_data.get_raw_data(convert_rate=16000, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get('text', '').strip()
+        return text.lower() or None
+
     def _can_use_google_cloud(self) -> bool:
         """Check if Google Cloud credentials are available"""
         gcp_creds_path = self.config.get('GCP_CREDENTIALS_PATH')
         return gcp_creds_path and os.path.exists(gcp_creds_path)
 
     async def speak(self, text: str):
-        """Asynchronously queue text to be spoken by the TTS worker thread."""
+        """Queue text for the speech worker and wait until it has been spoken."""
         if not text:
             return
         self.logger.info(f"Speaking: '{text[:50]}...'")
+        if self._speech_worker_task is None or self._speech_worker_task.done():
+            self._speech_queue = asyncio.Queue()
+            self._speech_worker_task = asyncio.ensure_future(self._speech_worker())
+
+        done = asyncio.get_running_loop().create_future()
+        await self._speech_queue.put((text, done))
         try:
-            tts = gTTS(text=text, lang='en')
-            fp = BytesIO()
-            tts.write_to_fp(fp)
-            fp.seek(0)
-            mixer.music.load(fp)
-            mixer.music.play()
-            while mixer.music.get_busy():
-                await asyncio.sleep(0.1)
-        except Exception as e:
-            self.logger.error(f"Failed to speak: {e}")
+            # wait() returns when cleanup cancels the entry, but still raises if this caller is cancelled
+            await asyncio.wait((done,))
+        except asyncio.CancelledError:
+            done.cancel()  # Mark the entry skipped so the worker doesn't speak it later
+            raise
+
+    async def _speech_worker(self):
+        """Speak queued utterances in order, so overlapping calls never cut each other off."""
+        while True:
+            text, done = await self._speech_queue.get()
+            if done.done():
+                continue  # Its caller was cancelled while the entry waited
+            try:
+                # gTTS performs a blocking HTTP request per utterance
+                fp = await to_thread(self._synthesize, text)
+                mixer.music.load(fp)
+                mixer.music.play()
+                while mixer.music.get_busy():
+                    await asyncio.sleep(0.1)
+            except Exception as e:
+                self.logger.error(f"Failed to speak: {e}")
+            finally:
+                if not done.done():
+                    done.set_result(None)
 
+    def _synthesize(self, text: str) -> BytesIO:
+        """Render text to an in-memory MP3 with gTTS (blocking)"""
+        fp = BytesIO()
+        gTTS(text=text, lang='en').write_to_fp(fp)
+        fp.seek(0)
+        return fp
 
     async def cleanup(self):
         """Cleanup voice processor resources"""
         self.logger.info("Cleaning up voice processor...")
         await self.stop_listening()
+        if self._speech_worker_task:
+            self._speech_worker_task.cancel()
+        # Release callers still waiting on utterances that will never be spoken
+        while self._speech_queue is not None and not self._speech_queue.empty():
+            _, done = self._speech_queue.get_nowait()
+            done.cancel()
         mixer.quit()
         self.logger.info("Voice processor cleanup completed")
 
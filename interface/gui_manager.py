@@ -1,18 +1,43 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, messagebox
+from tkinter import font as tkfont
 import logging
-import threading
 import asyncio
-from typing import Callable, Dict, Any
+import textwrap
+from collections import deque
+from typing import Callable, Dict, Any, List
+
+# Foreground colour per chat message tag
+CHAT_TAG_COLORS = {
+    "user": "#0066cc",
+    "cherry": "#cc6600",
+    "system": "#666666",
+}
+
+# Characters per rendered chat line; longer messages wrap onto continuation lines
+CHAT_WRAP_WIDTH = 60
+
+# Messages kept in the chat history; older ones are dropped
+CHAT_HISTORY_LIMIT = 1000
+
+# Wrapped lines kept for the chat view; once CHAT_LINE_TRIM more accumulate,
+# the oldest are dropped in one batch
+CHAT_LINE_LIMIT = 5000
+CHAT_LINE_TRIM = 500
+
+# Messages arriving within this many milliseconds share one chat view render
+CHAT_FLUSH_MS = 50
 
 class GUIManager:
     """Manages the Cherry AI Assistant GUI interface"""
 
-    def __init__(self, cherry_brain, config: Dict[str, Any], event_loop):
+    def __init__(self, cherry_brain, config: Dict[str, Any], event_loop,
+                 post_to_ui: Callable[[Callable], None]):
         self.cherry_brain = cherry_brain
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.event_loop = event_loop
+        self.post_to_ui = post_to_ui  # Schedules a callable on the Tk main thread
         self.root = None
         self.is_visible = False
         self.chat_display = None
@@ -20,7 +45,19 @@ class GUIManager:
         self.send_button = None
         self.status_label = None
         self.voice_button = None
-        self.chat_history = []
+        self.chat_scrollbar = None
+        # Chat history as parallel columns rather than a dict per message; see get_history()
+        self._history_timestamps = deque(maxlen=CHAT_HISTORY_LIMIT)
+        self._history_messages = deque(maxlen=CHAT_HISTORY_LIMIT)
+        self._history_tags = deque(maxlen=CHAT_HISTORY_LIMIT)
+
+        # Virtual chat view: every wrapped line is kept here, but only the
+        # slice starting at _chat_top is materialised in the Listbox
+        self._chat_lines = []
+        self._chat_top = 0
+        self._chat_follow = True
+        self._chat_line_height = 1
+        self._chat_render_id = None  # Pending after() id of a coalesced render
 
     def initialize(self):
         """Initialize the GUI in the main thread"""
@@ -36,6 +73,7 @@ class GUIManager:
             self.root.title("🍒 Cherry AI Assistant")
             self.root.geometry("500x600")
             self.root.withdraw()  # Start hidden
+            self.root.report_callback_exception = self._report_callback_exception
 
             try:
                 icon_path = self.config['ASSETS_DIR'] / 'cherry_icon.ico'
@@ -64,9 +102,11 @@ class GUIManager:
         self.status_label.grid(row=1, column=0, columnspan=2, pady=(0, 10))
         chat_frame = ttk.LabelFrame(main_frame, text="Conversation", padding="5")
         chat_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
-        self.chat_display = scrolledtext.ScrolledText(chat_frame, wrap=tk.WORD, width=50, height=20,
-                                                      font=('Arial', 10), state=tk.DISABLED)
+        self.chat_display = tk.Listbox(chat_frame, width=50, height=20, font=('Arial', 10),
+                                       activestyle='none', highlightthickness=0, borderwidth=0)
         self.chat_display.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.chat_scrollbar = ttk.Scrollbar(chat_frame, orient=tk.VERTICAL, command=self._on_chat_scroll)
+        self.chat_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         input_frame = ttk.Frame(main_frame)
         input_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         self.input_entry = ttk.Entry(input_frame, font=('Arial', 10))
@@ -92,15 +132,15 @@ class GUIManager:
         self.root.rowconfigure(0, weight=1)
 
     def _setup_layout(self):
-        self.chat_display.configure(state=tk.NORMAL)
-        self.chat_display.tag_configure("user", foreground="#0066cc", font=('Arial', 10, 'bold'))
-        self.chat_display.tag_configure("cherry", foreground="#cc6600", font=('Arial', 10))
-        self.chat_display.tag_configure("system", foreground="#666666", font=('Arial', 9, 'italic'))
-        self.chat_display.tag_configure("timestamp", foreground="#888888", font=('Arial', 8))
-        self.chat_display.configure(state=tk.DISABLED)
+        chat_font = tkfont.Font(font=self.chat_display.cget('font'))
+        self._chat_line_height = max(1, chat_font.metrics('linespace'))
 
     def _bind_events(self):
         self.input_entry.bind('<Return>', lambda e: self._on_send_click())
+        self.chat_display.bind('<Configure>', lambda e: self._render_chat_view())
+        self.chat_display.bind('<MouseWheel>', self._on_chat_mousewheel)
+        self.chat_display.bind('<Button-4>', self._on_chat_mousewheel)
+        self.chat_display.bind('<Button-5>', self._on_chat_mousewheel)
         self.root.protocol("WM_DELETE_WINDOW", self._on_window_close)
         self.root.bind('<Escape>', lambda e: self.hide())
 
@@ -124,17 +164,11 @@ class GUIManager:
     def _on_voice_click(self):
         try:
             if hasattr(self.cherry_brain, 'is_listening') and self.cherry_brain.is_listening:
-                asyncio.run_coroutine_threadsafe(
-                    self.cherry_brain.stop_listening(),
-                    self.event_loop
-                )
+                self.event_loop.create_task(self.cherry_brain.stop_listening())
                 self.voice_button.configure(text="🎤 Voice")
                 self._add_system_message("Voice listening stopped")
             else:
-                asyncio.run_coroutine_threadsafe(
-                    self.cherry_brain.start_listening(),
-                    self.event_loop
-                )
+                self.event_loop.create_task(self.cherry_brain.start_listening())
                 self.voice_button.configure(text="🔴 Stop")
                 self._add_system_message("Voice listening started...")
         except Exception as e:
@@ -150,10 +184,13 @@ class GUIManager:
 
     def _on_clear_click(self):
         try:
-            self.chat_display.configure(state=tk.NORMAL)
-            self.chat_display.delete(1.0, tk.END)
-            self.chat_display.configure(state=tk.DISABLED)
-            self.chat_history.clear()
+            self._history_timestamps.clear()
+            self._history_messages.clear()
+            self._history_tags.clear()
+            self._chat_lines.clear()
+            self._chat_top = 0
+            self._chat_follow = True
+            self._render_chat_view()
             self._add_system_message("Chat cleared")
         except Exception as e:
             self.logger.error(f"Error clearing chat: {e}")
@@ -181,32 +218,39 @@ class GUIManager:
     def _process_user_input(self, message: str):
         try:
             self._update_status("Processing...", "orange")
-            def process_async():
-                try:
-                    future = asyncio.run_coroutine_threadsafe(
-                        self.cherry_brain.process_input(message, {'input_type': 'text'}),
-                        self.event_loop
-                    )
-                    future.result(timeout=20)  # Wait for completion
-                    self.event_loop.call_soon_threadsafe(self._update_status, "Ready", "green")
-                except Exception as e:
-                    self.logger.error(f"Error processing input in thread: {e}")
-                    self.event_loop.call_soon_threadsafe(self._add_system_message, f"Error: {str(e)}")
-                    self.event_loop.call_soon_threadsafe(self._update_status, "Error", "red")
-
-            threading.Thread(target=process_async, daemon=True).start()
+            # The asyncio loop is stepped from the Tk mainloop, so the task can
+            # be scheduled directly and its completion handled on this thread
+            task = self.event_loop.create_task(
+                self.cherry_brain.process_input(message, {'input_type': 'text'})
+            )
+            task.add_done_callback(self._on_input_processed)
         except Exception as e:
             self.logger.error(f"Error processing user input: {e}")
             self._add_system_message(f"Error: {str(e)}")
 
+    def _on_input_processed(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            self._update_status("Ready", "green")
+        else:
+            self.logger.error(f"Error processing input: {error}")
+            self._add_system_message(f"Error: {str(error)}")
+            self._update_status("Error", "red")
+
     def add_conversation_message(self, sender: str, message: str):
-        """Public method to add a message to the conversation view, called via callback."""
+        """Public method to add a message to the conversation view, called via callback.
+
+        Safe from any thread: the message is handed to the Tk thread's queue
+        rather than waking the asyncio loop.
+        """
         if sender == "user":
-            self.event_loop.call_soon_threadsafe(self._add_user_message, message)
+            self.post_to_ui(lambda: self._add_user_message(message))
         elif sender == "cherry":
-            self.event_loop.call_soon_threadsafe(self._add_cherry_message, message)
+            self.post_to_ui(lambda: self._add_cherry_message(message))
         else:
-            self.event_loop.call_soon_threadsafe(self._add_system_message, message)
+            self.post_to_ui(lambda: self._add_system_message(message))
 
     def _add_user_message(self, message: str):
         self._add_chat_message(f"You: {message}", "user")
@@ -218,23 +262,86 @@ class GUIManager:
         self._add_chat_message(f"System: {message}", "system")
 
     def _add_chat_message(self, message: str, tag: str):
-        try:
-            if not self.root:
-                return
-            self.chat_display.configure(state=tk.NORMAL)
-            import datetime
-            timestamp = datetime.datetime.now().strftime("%H:%M")
-            self.chat_display.insert(tk.END, f"[{timestamp}] ", "timestamp")
-            self.chat_display.insert(tk.END, f"{message}\n", tag)
-            self.chat_display.see(tk.END)
-            self.chat_display.configure(state=tk.DISABLED)
-            self.chat_history.append({
-                'timestamp': timestamp,
-                'message': message,
-                'tag': tag
-            })
-        except Exception as e:
-            self.logger.error(f"Error adding chat message: {e}")
+        if not self.root:
+            return
+        import datetime
+        timestamp = datetime.datetime.now().strftime("%H:%M")
+        self._history_timestamps.append(timestamp)
+        self._history_messages.append(message)
+        self._history_tags.append(tag)
+        self._chat_lines.extend((line, tag) for line in self._wrap_chat_message(f"[{timestamp}] {message}"))
+        excess = len(self._chat_lines) - CHAT_LINE_LIMIT
+        if excess >= CHAT_LINE_TRIM:
+            del self._chat_lines[:excess]
+            self._chat_top = max(0, self._chat_top - excess)
+        if self._chat_render_id is None:
+            self._chat_render_id = self.root.after(CHAT_FLUSH_MS, self._flush_chat_view)
+
+    def _flush_chat_view(self):
+        """Render every chat line added since the last flush in one pass"""
+        self._chat_render_id = None
+        self._render_chat_view()
+
+    def get_history(self) -> List[Dict[str, str]]:
+        """Chat history as a list of {'timestamp', 'message', 'tag'} dicts, oldest first"""
+        return [
+            {'timestamp': timestamp, 'message': message, 'tag': tag}
+            for timestamp, message, tag in zip(self._history_timestamps, self._history_messages, self._history_tags)
+        ]
+
+    def _wrap_chat_message(self, text: str):
+        """Split a message into display lines for the Listbox"""
+        lines = []
+        for paragraph in text.splitlines() or [""]:
+            lines.extend(textwrap.wrap(paragraph, CHAT_WRAP_WIDTH, subsequent_indent="    ") or [""])
+        return lines
+
+    def _visible_chat_rows(self) -> int:
+        return max(1, self.chat_display.winfo_height() // self._chat_line_height)
+
+    def _render_chat_view(self):
+        """Materialise only the chat lines that fit in the viewport"""
+        if not self.root or not self.chat_display:
+            return
+        total = len(self._chat_lines)
+        rows = self._visible_chat_rows()
+        max_top = max(0, total - rows)
+        if self._chat_follow:
+            self._chat_top = max_top
+        self._chat_top = min(max(0, self._chat_top), max_top)
+
+        visible = self._chat_lines[self._chat_top:self._chat_top + rows]
+        self.chat_display.delete(0, tk.END)
+        if visible:
+            self.chat_display.insert(tk.END, *(line for line, _ in visible))
+            for index, (_, tag) in enumerate(visible):
+                self.chat_display.itemconfigure(index, foreground=CHAT_TAG_COLORS.get(tag, "black"))
+
+        if total:
+            self.chat_scrollbar.set(self._chat_top / total, (self._chat_top + len(visible)) / total)
+        else:
+            self.chat_scrollbar.set(0.0, 1.0)
+
+    def _on_chat_scroll(self, *args):
+        """Scrollbar command: move the virtual viewport instead of the Listbox"""
+        total = len(self._chat_lines)
+        rows = self._visible_chat_rows()
+        if args[0] == 'moveto':
+            self._chat_top = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            self._chat_top += step * rows if args[2] == 'pages' else step
+        self._chat_follow = self._chat_top >= total - rows
+        self._render_chat_view()
+
+    def _on_chat_mousewheel(self, event):
+        direction = -1 if event.num == 4 or event.delta > 0 else 1
+        self._on_chat_scroll('scroll', direction * 3, 'units')
+        return "break"
+
+    def _report_callback_exception(self, exc_type, exc_value, exc_traceback):
+        """Log exceptions raised inside Tk callbacks with their full traceback"""
+        self.logger.error("Unhandled exception in Tk callback", exc_info=(exc_type, exc_value, exc_traceback))
 
     def _update_status(self, status: str, color: str = "black"):
         try:
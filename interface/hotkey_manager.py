@@ -4,7 +4,7 @@ Handles global hotkey detection and registration
 """
 
 import logging
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Callable, Any
 
 try:
@@ -27,9 +27,15 @@ class HotkeyManager:
         self.hotkeys = {}
         self.is_listening = False
 
+        # Every key that appears in some hotkey; other key presses cannot complete one
+        self._hotkey_keys = frozenset()
+
         # Hotkey state tracking
         self.pressed_keys = set()
 
+        # Callbacks run here so the listener thread never waits on them; created by start_listening
+        self._executor = None
+
     def register_hotkeys(self, hotkey_map: Dict[str, Callable]):
         """Register global hotkeys"""
         try:
@@ -49,6 +55,8 @@ class HotkeyManager:
                 except Exception as e:
                     self.logger.error(f"Error parsing hotkey '{hotkey_str}': {e}")
 
+            self._update_hotkey_keys()
+
             # Start listening if not already
             if not self.is_listening:
                 self.start_listening()
@@ -64,10 +72,13 @@ class HotkeyManager:
 
             self.is_listening = True
 
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cherry-hotkey")
+
             # Create keyboard listener
             self.listener = keyboard.Listener(
-                on_press=self._on_key_press,
-                on_release=self._on_key_release,
+                on_press=self._safe(self._on_key_press),
+                on_release=self._safe(self._on_key_release),
                 suppress=False  # Don't suppress keys
             )
 
@@ -98,64 +109,75 @@ class HotkeyManager:
         except Exception as e:
             self.logger.error(f"Error stopping hotkey listener: {e}")
 
+    def _safe(self, handler: Callable) -> Callable:
+        """Wrap a listener callback once so an error is logged instead of stopping the listener"""
+        def wrapper(key):
+            try:
+                handler(key)
+            except Exception:
+                self.logger.exception(f"Error in hotkey listener callback {handler.__name__}")
+        return wrapper
+
     def _on_key_press(self, key):
         """Handle key press event"""
-        try:
-            # Normalize the key
-            normalized_key = self._normalize_key(key)
-            self.pressed_keys.add(normalized_key)
+        normalized_key = self._normalize_key(key)
+        self.pressed_keys.add(normalized_key)
 
-            # Check for hotkey matches
-            self._check_hotkey_match()
+        # Plain typing never touches the hotkey table
+        if normalized_key not in self._hotkey_keys:
+            return
 
-        except Exception as e:
-            self.logger.error(f"Error handling key press: {e}")
+        # Check for hotkey matches
+        self._check_hotkey_match()
 
     def _on_key_release(self, key):
         """Handle key release event"""
-        try:
-            # Normalize the key
-            normalized_key = self._normalize_key(key)
-            self.pressed_keys.discard(normalized_key)
-
-        except Exception as e:
-            self.logger.error(f"Error handling key release: {e}")
+        self.pressed_keys.discard(self._normalize_key(key))
 
     def _normalize_key(self, key):
         """Normalize key for comparison"""
-        try:
-            if hasattr(key, 'char') and key.char is not None:
-                return keyboard.KeyCode.from_char(key.char.lower())
-            else:
-                return key
-        except Exception:
-            return key
+        if getattr(key, 'char', None) is not None:
+            return keyboard.KeyCode.from_char(key.char.lower())
+        return key
 
     def _check_hotkey_match(self):
         """Check if current pressed keys match any registered hotkey"""
-        try:
-            current_keys = frozenset(self.pressed_keys)
+        hotkey_info = self.hotkeys.get(frozenset(self.pressed_keys))
+        if hotkey_info is None:
+            return
 
-            for hotkey_keys, hotkey_info in self.hotkeys.items():
-                if current_keys == hotkey_keys:
-                    self.logger.info(f"Hotkey triggered: {hotkey_info['hotkey_str']}")
+        self.logger.info(f"Hotkey triggered: {hotkey_info['hotkey_str']}")
 
-                    # Execute callback in separate thread to avoid blocking
-                    callback_thread = threading.Thread(
-                        target=hotkey_info['callback'],
-                        daemon=True
-                    )
-                    callback_thread.start()
-                    break
+        executor = self._executor
+        if executor is None:
+            return  # Stopped while this key event was being handled
 
-        except Exception as e:
-            self.logger.error(f"Error checking hotkey match: {e}")
+        # Execute callback on a worker thread to avoid blocking
+        future = executor.submit(hotkey_info['callback'])
+        future.add_done_callback(self._log_callback_error)
+
+    def _log_callback_error(self, future):
+        """Log an exception raised by a hotkey callback"""
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error(f"Error in hotkey callback: {future.exception()}")
+
+    def _update_hotkey_keys(self):
+        """Recompute the union of keys used by registered hotkeys"""
+        self._hotkey_keys = frozenset().union(*self.hotkeys)
 
     def add_hotkey(self, hotkey_str: str, callback: Callable):
         """Add a single hotkey"""
         try:
-            hotkey_map = {hotkey_str: callback}
-            self.register_hotkeys({**self.hotkeys_as_dict(), **hotkey_map})
+            hotkey = keyboard.HotKey.parse(hotkey_str)
+            self.hotkeys[frozenset(hotkey)] = {
+                'callback': callback,
+                'hotkey_str': hotkey_str
+            }
+            self._update_hotkey_keys()
+            self.logger.info(f"Registered hotkey: {hotkey_str}")
+
+            if not self.is_listening:
+                self.start_listening()
 
         except Exception as e:
             self.logger.error(f"Error adding hotkey: {e}")
@@ -168,6 +190,7 @@ class HotkeyManager:
 
             if hotkey_key in self.hotkeys:
                 del self.hotkeys[hotkey_key]
+                self._update_hotkey_keys()
                 self.logger.info(f"Removed hotkey: {hotkey_str}")
             else:
                 self.logger.warning(f"Hotkey not found: {hotkey_str}")
@@ -198,6 +221,9 @@ class HotkeyManager:
     def stop(self):
         """Stop the hotkey manager"""
         self.stop_listening()
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
         self.logger.info("Hotkey manager stopped")
 
     def get_status(self) -> Dict[str, Any]:
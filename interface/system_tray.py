@@ -5,6 +5,7 @@ Handles background operation and system tray integration
 
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Dict, Any
 from pathlib import Path
 
@@ -17,21 +18,37 @@ except ImportError:
     import sys
     sys.exit(1)
 
+# Colour of the status dot drawn on the tray icon; statuses not listed show the plain icon
+STATUS_DOT_COLORS = {
+    'listening': 'red',
+    'processing': 'orange',
+}
+
 class SystemTrayManager:
     """Manages system tray integration for Cherry"""
 
-    def __init__(self, show_callback: Callable, quit_callback: Callable, config: Dict[str, Any], event_loop):
+    def __init__(self, show_callback: Callable, quit_callback: Callable, config: Dict[str, Any],
+                 post_to_ui: Callable[[Callable], None]):
         self.show_callback = show_callback
         self.quit_callback = quit_callback
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self.event_loop = event_loop  # Explicitly passed from the main thread
+        self.post_to_ui = post_to_ui  # Schedules a callable on the Tk main thread
 
         self.icon = None
         self.tray_thread = None
         self.is_running = False
+        self.status_text = "Running"
+
+        # Notifications are shown here, one at a time, so callers never wait on the OS
+        self._notify_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cherry-notify")
 
         self.tray_image = self._create_icon_image()
+        # Status variants are drawn once; update_icon only swaps references
+        self._icon_variants = {'normal': self.tray_image}
+        for status, color in STATUS_DOT_COLORS.items():
+            self._icon_variants[status] = self._overlay_dot(color)
+        self.menu = self._create_menu()
 
     def _create_icon_image(self) -> Image.Image:
         """Create the system tray icon image"""
@@ -39,8 +56,18 @@ class SystemTrayManager:
             icon_path = self.config['ASSETS_DIR'] / 'cherry_icon.png'
             if icon_path.exists():
                 return Image.open(icon_path)
-            else:
-                return self._create_simple_cherry_icon()
+
+            # The drawn fallback is saved once and loaded on later starts
+            cached_path = self.config['ASSETS_DIR'] / 'cherry_icon.cached.png'
+            if cached_path.exists():
+                return Image.open(cached_path)
+
+            image = self._create_simple_cherry_icon()
+            try:
+                image.save(cached_path, optimize=True)
+            except OSError as e:
+                self.logger.debug(f"Could not cache tray icon: {e}")
+            return image
         except Exception as e:
             self.logger.warning(f"Error loading icon, creating simple icon: {e}")
             return self._create_simple_cherry_icon()
@@ -55,11 +82,20 @@ class SystemTrayManager:
         draw.ellipse([35, 12, 42, 18], fill='#32CD32', outline='#228B22')
         return image
 
+    def _overlay_dot(self, color: str) -> Image.Image:
+        """Copy of the tray icon with a status dot in the bottom-right corner"""
+        image = self.tray_image.convert('RGBA')
+        width, height = image.size
+        radius = max(4, width // 8)
+        draw = ImageDraw.Draw(image)
+        draw.ellipse([width - 2 * radius, height - 2 * radius, width - 1, height - 1], fill=color, outline='white')
+        return image
+
     def _create_menu(self) -> pystray.Menu:
         """Create the system tray context menu."""
         return pystray.Menu(
             pystray.MenuItem("🍒 Show Cherry", self._on_show_click, default=True),
-            pystray.MenuItem("Status: Running", None, enabled=False),
+            pystray.MenuItem(lambda item: f"Status: {self.status_text}", None, enabled=False),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("Quit Cherry", self._on_quit_click)
         )
@@ -74,7 +110,7 @@ class SystemTrayManager:
                 "cherry",
                 self.tray_image,
                 "Cherry AI Assistant",
-                self._create_menu()
+                self.menu
             )
 
             self.tray_thread = threading.Thread(target=self.icon.run, daemon=True)
@@ -84,8 +120,31 @@ class SystemTrayManager:
         except Exception as e:
             self.logger.error(f"Error starting system tray: {e}", exc_info=True)
 
+    def update_status(self, status: str):
+        """Update the status line shown in the tray menu without rebuilding it."""
+        self.status_text = status
+        if self.icon:
+            self.icon.update_menu()
+
+    def update_icon(self, status: str):
+        """Show the pre-rendered icon for a status ('normal', 'listening' or 'processing')"""
+        if self.icon:
+            self.icon.icon = self._icon_variants.get(status, self._icon_variants['normal'])
+
+    def show_notification(self, title: str, message: str):
+        """Show a desktop notification from the tray icon without blocking the caller."""
+        if self.icon:
+            self._notify_executor.submit(self._notify, title, message)
+
+    def _notify(self, title: str, message: str):
+        try:
+            self.icon.notify(message, title)
+        except Exception as e:
+            self.logger.error(f"Error showing notification: {e}")
+
     def stop(self):
         """Stop the system tray icon."""
+        self._notify_executor.shutdown(wait=False)
         if self.icon:
             self.icon.stop()
         self.is_running = False
@@ -93,13 +152,11 @@ class SystemTrayManager:
 
     def _on_show_click(self, icon, item):
         """Handle show menu item click in a thread-safe way."""
-        if self.show_callback and self.event_loop.is_running():
-            # Use root.after to delegate to the main GUI thread
-            self.show_callback()
+        if self.show_callback:
+            self.post_to_ui(self.show_callback)
 
     def _on_quit_click(self, icon, item):
         """Handle quit menu item click in a thread-safe way."""
         self.logger.info("Quit requested from system tray.")
-        if self.quit_callback and self.event_loop.is_running():
-            # Schedule the quit callback on the main GUI/app thread
-            self.quit_callback()
+        if self.quit_callback:
+            self.post_to_ui(self.quit_callback)
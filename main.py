@@ -6,8 +6,9 @@ Main application entry point - Manages asyncio event loop and GUI
 
 import asyncio
 import logging
+import os
+import queue
 import sys
-import threading
 from pathlib import Path
 
 # Add project root to Python path
@@ -15,12 +16,25 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from config.settings import load_config
-from core.cherry_brain import CherryBrain
-from interface.gui_manager import GUIManager
-from interface.hotkey_manager import HotkeyManager
-from interface.system_tray import SystemTrayManager
 from utils.logger import setup_logging
 
+# Bounds (ms) for the interval between asyncio loop iterations driven from
+# the Tk mainloop: as soon as possible when callbacks are ready, at most
+# GUEST_TICK_BUSY_MS while timers are pending, GUEST_TICK_IDLE_MS otherwise
+GUEST_TICK_MIN_MS = 1
+GUEST_TICK_BUSY_MS = 50
+GUEST_TICK_IDLE_MS = 100
+
+# Seconds to wait for cancelled tasks to finish during shutdown
+SHUTDOWN_TIMEOUT = 2.0
+
+# Tray menu status line for each assistant state reported by the brain
+TRAY_STATUS_TEXT = {
+    'processing': "Working",
+    'listening': "Listening",
+    'normal': "Running",
+}
+
 class CherryAssistant:
     """Main application class orchestrating all components."""
 
@@ -33,26 +47,38 @@ class CherryAssistant:
         self.gui_manager = None
         self.tray_manager = None
         self.hotkey_manager = None
+        self._tick_id = None
+        self._brain_status = 'normal'
+        # Callbacks posted from other threads, drained on the Tk thread each tick
+        self._gui_queue = queue.SimpleQueue()
 
     def initialize(self):
         """Initializes all components. Called from the main thread."""
         self.logger.info("Initializing Cherry AI Assistant...")
 
+        # Heavy modules (Gemini, ChromaDB, speech, CV) are imported here rather
+        # than at module load so startup reaches this point quickly
+        from core.cherry_brain import CherryBrain
+        from interface.gui_manager import GUIManager
+        from interface.hotkey_manager import HotkeyManager
+        from interface.system_tray import SystemTrayManager
+
         self.brain = CherryBrain(self.config)
-        self.gui_manager = GUIManager(self.brain, self.config, self.event_loop)
+        self.gui_manager = GUIManager(self.brain, self.config, self.event_loop, self.post_to_ui)
         self.brain.set_gui_callback(self.gui_manager.add_conversation_message)
+        self.brain.set_status_callback(self._on_brain_status)
 
-        future = asyncio.run_coroutine_threadsafe(self.brain.initialize(), self.event_loop)
-        future.result()  # Wait for async initialization to complete
+        # The loop is owned by this thread and not yet ticking, so drive it directly
+        self.event_loop.run_until_complete(self.brain.initialize())
 
         self.gui_manager.initialize()
 
-        # Pass the event loop to the SystemTrayManager
-        self.tray_manager = SystemTrayManager(self.show_gui, self.quit_application, self.config, self.event_loop)
+        # Tray callbacks are marshalled onto the Tk thread by the tray manager itself
+        self.tray_manager = SystemTrayManager(self.gui_manager.show, self.quit_application, self.config, self.post_to_ui)
         self.hotkey_manager = HotkeyManager(self.config)
         self.hotkey_manager.register_hotkeys({
             '<ctrl>+<alt>+c': self.show_gui,
-            '<ctrl>+<alt>+q': self.quit_application
+            '<ctrl>+<alt>+q': lambda: self.post_to_ui(self.quit_application)
         })
 
         self.logger.info("Cherry AI Assistant initialized successfully!")
@@ -62,12 +88,69 @@ class CherryAssistant:
         self.tray_manager.start()
         self.logger.info("Cherry AI Assistant is now running...")
         if self.gui_manager and self.gui_manager.root:
+            self._tick()
             self.gui_manager.root.mainloop()
 
+    def _tick(self):
+        """Run posted UI callbacks and one iteration of the asyncio loop from inside the Tk mainloop."""
+        self._drain_gui_queue()
+        if not (self.gui_manager and self.gui_manager.root):
+            return  # A posted callback shut the application down
+        self.event_loop.call_soon(self.event_loop.stop)
+        self.event_loop.run_forever()
+        if self.gui_manager.root:
+            self._tick_id = self.gui_manager.root.after(self._next_tick_delay(), self._tick)
+
+    def _drain_gui_queue(self):
+        """Run every callback posted with post_to_ui since the last tick."""
+        while True:
+            try:
+                callback = self._gui_queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                callback()
+            except Exception:
+                self.logger.exception("Error in posted UI callback")
+
+    def _next_tick_delay(self) -> int:
+        """Milliseconds until the asyncio loop next has work to do."""
+        loop = self.event_loop
+        if not self._gui_queue.empty() or getattr(loop, '_ready', None):
+            return GUEST_TICK_MIN_MS
+        if not hasattr(loop, '_scheduled'):
+            # uvloop keeps its queues in libuv, so only task liveness is visible
+            return GUEST_TICK_BUSY_MS if asyncio.all_tasks(loop) else GUEST_TICK_IDLE_MS
+        scheduled = getattr(loop, '_scheduled', None)
+        if scheduled:
+            delay = int((scheduled[0].when() - loop.time()) * 1000)
+            return min(max(delay, GUEST_TICK_MIN_MS), GUEST_TICK_BUSY_MS)
+        return GUEST_TICK_IDLE_MS
+
+    def _stop_ticking(self):
+        """Cancel the pending guest-loop tick so the loop can be driven directly."""
+        if self._tick_id and self.gui_manager and self.gui_manager.root:
+            self.gui_manager.root.after_cancel(self._tick_id)
+        self._tick_id = None
+
+    def post_to_ui(self, callback):
+        """Queue a callback to run on the Tk main thread at the next tick. Safe from any thread."""
+        self._gui_queue.put(callback)
+
+    def _on_brain_status(self, status: str):
+        """Mirror the assistant's state in the tray, and notify when a task finishes out of sight."""
+        previous, self._brain_status = self._brain_status, status
+        if not self.tray_manager:
+            return
+        self.tray_manager.update_icon(status)
+        self.tray_manager.update_status(TRAY_STATUS_TEXT.get(status, "Running"))
+        if previous == 'processing' and status != 'processing' and not self.gui_manager.is_gui_visible():
+            self.tray_manager.show_notification("Cherry", "Finished working on your request")
+
     def show_gui(self):
         """Thread-safe method to show the GUI."""
-        if self.gui_manager and self.gui_manager.root:
-            self.gui_manager.root.after(0, self.gui_manager.show)
+        if self.gui_manager:
+            self.post_to_ui(self.gui_manager.show)
 
     def quit_application(self):
         """Gracefully shuts down the entire application."""
@@ -78,28 +161,65 @@ class CherryAssistant:
         if self.tray_manager:
             self.tray_manager.stop()
 
+        self._stop_ticking()
         if self.brain:
-            asyncio.run_coroutine_threadsafe(self.brain.cleanup(), self.event_loop).result()
+            if self.event_loop.is_running():
+                self.logger.warning("Event loop still running during shutdown; skipping brain cleanup")
+            else:
+                self.event_loop.run_until_complete(self.brain.cleanup())
+        self._cancel_pending_tasks()
 
-        self.event_loop.call_soon_threadsafe(self.event_loop.stop)
-        
         if self.gui_manager and self.gui_manager.root:
-            self.gui_manager.root.after(0, self.gui_manager.destroy)
+            self.gui_manager.destroy()
+
+    def _cancel_pending_tasks(self):
+        """Cancel leftover tasks and let their finalizers run before the loop is closed."""
+        loop = self.event_loop
+        if loop.is_running() or loop.is_closed():
+            return
+        pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+        for task in pending:
+            task.cancel()
+        try:
+            if pending:
+                loop.run_until_complete(asyncio.wait_for(
+                    asyncio.gather(*pending, return_exceptions=True), timeout=SHUTDOWN_TIMEOUT
+                ))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        except Exception as e:
+            self.logger.error(f"Error cancelling pending tasks: {e}")
 
 def main():
     """Application entry point."""
     print("🍒 Starting Cherry AI Desktop Assistant...")
 
-    loop = asyncio.get_event_loop()
+    # Development hooks, set in the shell environment:
+    # CHERRY_PROFILE writes a cProfile dump to cherry.prof on exit,
+    # CHERRY_ASYNCIO_DEBUG logs callbacks that block the loop for over 50 ms
+    if os.getenv("CHERRY_PROFILE"):
+        import atexit
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        atexit.register(lambda: profiler.dump_stats("cherry.prof"))
+
+    # Proactor (IOCP) is the default from 3.8 but select it explicitly so
+    # subprocess pipes and socket I/O never fall back to select() polling
+    if sys.platform.startswith("win"):
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    else:
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    if os.getenv("CHERRY_ASYNCIO_DEBUG"):
+        loop.set_debug(True)
+        loop.slow_callback_duration = 0.05
     assistant = CherryAssistant(event_loop=loop)
 
-    def run_asyncio_loop(loop):
-        asyncio.set_event_loop(loop)
-        loop.run_forever()
-
-    asyncio_thread = threading.Thread(target=run_asyncio_loop, args=(loop,), daemon=True)
-    asyncio_thread.start()
-
     try:
         assistant.initialize()
         assistant.run()
@@ -109,9 +229,11 @@ def main():
         logging.getLogger().critical(f"Fatal error in main thread: {e}", exc_info=True)
     finally:
         print("\n🍒 Shutting down...")
-        if assistant.gui_manager and assistant.gui_manager.root.winfo_exists():
-             assistant.quit_application()
-        asyncio_thread.join(timeout=5)
+        if assistant.gui_manager and assistant.gui_manager.root:
+            assistant.quit_application()
+        else:
+            assistant._cancel_pending_tasks()
+        loop.close()
         print("\n🍒 Cherry AI Assistant shut down gracefully.")
 
 if __name__ == "__main__":
@@ -3,30 +3,59 @@ File Handler for Cherry AI Assistant
 Handles file operations, document creation, and file management
 """
 
+import fnmatch
+import io
 import os
 import logging
+import re
 import shutil
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List, Tuple
 from datetime import datetime
 
-try:
-    from docx import Document
-    import PyPDF2
-except ImportError:
-    print("File handling dependencies not installed. Install with:")
-    print("pip install python-docx PyPDF2")
+# python-docx and PyPDF2 are imported by the document helpers on first use, keeping them out of startup
+
+from utils.helpers import to_thread
+
+# Translation table replacing each of these characters with '_' in generated filenames
+INVALID_FILENAME_CHARS = str.maketrans(dict.fromkeys('<>:"/|?*', '_'))
+
+# Characters of a text file returned by read_file; the rest is reported as truncated
+READ_FILE_LIMIT = 1024 * 1024
+
+# Blank lines (possibly holding only whitespace) separate Word document paragraphs
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+def _join_paragraphs(parts: Iterable[str]) -> str:
+    """Join text blocks with blank lines, writing each into one buffer as it is produced"""
+    buf = io.StringIO()
+    for index, part in enumerate(parts):
+        if index:
+            buf.write('\n\n')
+        buf.write(part)
+    return buf.getvalue()
 
 class FileHandler:
     """Handles file operations for Cherry"""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], base_dir: Optional[Path] = None):
         self.config = config
         self.logger = logging.getLogger(__name__)
 
+        # Directory new files are created in, resolved once
+        self._base_dir = Path(base_dir) if base_dir is not None else Path.cwd()
+
         # Supported file types
         self.supported_text_formats = ['.txt', '.md', '.py', '.js', '.html', '.css', '.json']
         self.supported_doc_formats = ['.docx', '.pdf']
+        self._supported_formats = {
+            'text': self.supported_text_formats,
+            'document': self.supported_doc_formats
+        }
+
+        # Extension -> reader coroutine for document formats; text formats are read directly
+        self._readers = {'.pdf': self._read_pdf, '.docx': self._read_word_document}
+        self._text_formats = frozenset(self.supported_text_formats)
 
     async def create_file(self, filename: str, content: str, file_type: str = 'txt') -> Dict[str, Any]:
         """Create a new file with content"""
@@ -39,15 +68,14 @@ class FileHandler:
                 safe_filename += f'.{file_type}'
 
             # Create file path
-            file_path = Path.cwd() / safe_filename
+            file_path = self._base_dir / safe_filename
 
             # Write content based on file type
             if file_type.lower() == 'docx':
                 success = await self._create_word_document(file_path, content)
             else:
                 # Plain text file
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                await to_thread(file_path.write_text, content, encoding='utf-8')
                 success = True
 
             if success:
@@ -65,7 +93,7 @@ class FileHandler:
             self.logger.error(f"Error creating file: {e}")
             return {'success': False, 'error': str(e)}
 
-    async def read_file(self, filepath: str) -> Dict[str, Any]:
+    async def read_file(self, filepath: str, max_chars: int = READ_FILE_LIMIT) -> Dict[str, Any]:
         """Read content from a file"""
         try:
             file_path = Path(filepath)
@@ -74,64 +102,86 @@ class FileHandler:
                 return {'success': False, 'error': 'File not found'}
 
             # Read content based on file type
-            content = ""
             file_ext = file_path.suffix.lower()
+            reader = self._readers.get(file_ext)
+            truncated = False
 
-            if file_ext == '.pdf':
-                content = await self._read_pdf(file_path)
-            elif file_ext == '.docx':
-                content = await self._read_word_document(file_path)
-            elif file_ext in self.supported_text_formats:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+            if reader is not None:
+                content = await reader(file_path)
+            elif file_ext in self._text_formats:
+                content, truncated = await to_thread(self._read_text_sync, file_path, max_chars)
             else:
                 return {'success': False, 'error': f'Unsupported file type: {file_ext}'}
 
+            stat = file_path.stat()
             return {
                 'success': True,
                 'content': content,
+                'truncated': truncated,
                 'filepath': str(file_path),
-                'size': file_path.stat().st_size,
-                'modified': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
+                'size': stat.st_size,
+                'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
             }
 
         except Exception as e:
             self.logger.error(f"Error reading file: {e}")
             return {'success': False, 'error': str(e)}
 
+    @staticmethod
+    def _read_text_sync(filepath: Path, max_chars: int) -> Tuple[str, bool]:
+        """Up to max_chars of a text file, and whether more followed (blocking)"""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read(max_chars)
+            return content, bool(f.read(1))
+
     async def list_files(self, directory: str = ".", pattern: str = "*") -> List[Dict[str, Any]]:
         """List files in a directory"""
         try:
-            dir_path = Path(directory)
-
-            if not dir_path.exists() or not dir_path.is_dir():
-                return []
-
-            files = []
-            for file_path in dir_path.glob(pattern):
-                if file_path.is_file():
-                    stat = file_path.stat()
-                    files.append({
-                        'name': file_path.name,
-                        'path': str(file_path),
-                        'size': stat.st_size,
-                        'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                        'extension': file_path.suffix
-                    })
-
-            return sorted(files, key=lambda x: x['modified'], reverse=True)
+            # Directory reads and stats run on a worker thread
+            return await to_thread(self._list_files_sync, Path(directory), pattern)
 
         except Exception as e:
             self.logger.error(f"Error listing files: {e}")
             return []
 
+    @staticmethod
+    def _list_files_sync(dir_path: Path, pattern: str) -> List[Dict[str, Any]]:
+        """Describe the files in dir_path matching pattern, newest first (blocking)"""
+        if not dir_path.is_dir():
+            return []
+
+        entries = []
+        if '/' in pattern or os.sep in pattern or '**' in pattern:
+            # Patterns that reach into subdirectories still need glob
+            for file_path in dir_path.glob(pattern):
+                if file_path.is_file():
+                    entries.append((file_path.name, str(file_path), file_path.stat()))
+        else:
+            # scandir entries carry the file type from the directory read
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_file() and fnmatch.fnmatch(entry.name, pattern):
+                        entries.append((entry.name, entry.path, entry.stat()))
+
+        entries.sort(key=lambda entry: entry[2].st_mtime, reverse=True)
+        return [
+            {
+                'name': name,
+                'path': path,
+                'size': stat.st_size,
+                'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                'extension': os.path.splitext(name)[1]
+            }
+            for name, path, stat in entries
+        ]
+
     async def delete_file(self, filepath: str) -> bool:
         """Delete a file"""
         try:
             file_path = Path(filepath)
 
             if file_path.exists():
-                file_path.unlink()
+                await to_thread(file_path.unlink)
                 self.logger.info(f"Deleted file: {filepath}")
                 return True
             else:
@@ -142,8 +192,8 @@ class FileHandler:
             self.logger.error(f"Error deleting file: {e}")
             return False
 
-    async def copy_file(self, source: str, destination: str) -> bool:
-        """Copy a file"""
+    async def copy_file(self, source: str, destination: str, preserve_metadata: bool = True) -> bool:
+        """Copy a file; without preserve_metadata only the contents are copied"""
         try:
             source_path = Path(source)
             dest_path = Path(destination)
@@ -151,7 +201,16 @@ class FileHandler:
             if not source_path.exists():
                 return False
 
-            shutil.copy2(source_path, dest_path)
+            if preserve_metadata:
+                copy = shutil.copy2
+            else:
+                # copyfile skips the stat/chmod/utime calls but needs a file path, not a directory
+                copy = shutil.copyfile
+                if dest_path.is_dir():
+                    dest_path = dest_path / source_path.name
+
+            # Large copies block; run them off the event loop
+            await to_thread(copy, source_path, dest_path)
             self.logger.info(f"Copied file: {source} -> {destination}")
             return True
 
@@ -168,7 +227,8 @@ class FileHandler:
             if not source_path.exists():
                 return False
 
-            shutil.move(str(source_path), str(dest_path))
+            # Cross-device moves are copies; run them off the event loop
+            await to_thread(shutil.move, str(source_path), str(dest_path))
             self.logger.info(f"Moved file: {source} -> {destination}")
             return True
 
@@ -179,61 +239,66 @@ class FileHandler:
     async def _create_word_document(self, filepath: Path, content: str) -> bool:
         """Create a Word document"""
         try:
-            doc = Document()
-
-            # Split content into paragraphs
-            paragraphs = content.split('\n\n')
-
-            for paragraph_text in paragraphs:
-                if paragraph_text.strip():
-                    doc.add_paragraph(paragraph_text.strip())
-
-            doc.save(str(filepath))
+            # Building and zipping the document blocks; keep it off the event loop
+            await to_thread(self._create_word_document_sync, filepath, content)
             return True
 
         except Exception as e:
             self.logger.error(f"Error creating Word document: {e}")
             return False
 
+    @staticmethod
+    def _create_word_document_sync(filepath: Path, content: str):
+        """Write content to a Word document, one paragraph per blank-line-separated block (blocking)"""
+        from docx import Document
+        doc = Document()
+
+        # Split content into paragraphs
+        for paragraph_text in PARAGRAPH_BREAK.split(content):
+            paragraph_text = paragraph_text.strip()
+            if paragraph_text:
+                doc.add_paragraph(paragraph_text)
+
+        doc.save(str(filepath))
+
     async def _read_word_document(self, filepath: Path) -> str:
         """Read content from a Word document"""
         try:
-            doc = Document(str(filepath))
-            content = []
-
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    content.append(paragraph.text)
-
-            return '\n\n'.join(content)
+            return await to_thread(self._read_word_document_sync, filepath)
 
         except Exception as e:
             self.logger.error(f"Error reading Word document: {e}")
             return ""
 
+    @staticmethod
+    def _read_word_document_sync(filepath: Path) -> str:
+        """Join the non-empty paragraphs of a Word document (blocking)"""
+        from docx import Document
+        doc = Document(str(filepath))
+        return _join_paragraphs(paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip())
+
     async def _read_pdf(self, filepath: Path) -> str:
         """Read content from a PDF file"""
         try:
-            content = []
-
-            with open(filepath, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-
-                for page in pdf_reader.pages:
-                    content.append(page.extract_text())
-
-            return '\n\n'.join(content)
+            # Page parsing is CPU-bound pure Python; keep it off the event loop
+            return await to_thread(self._read_pdf_sync, filepath)
 
         except Exception as e:
             self.logger.error(f"Error reading PDF: {e}")
             return ""
 
+    @staticmethod
+    def _read_pdf_sync(filepath: Path) -> str:
+        """Extract the text of every page of a PDF (blocking)"""
+        import PyPDF2
+        with open(filepath, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            return _join_paragraphs(page.extract_text() or '' for page in pdf_reader.pages)
+
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename to remove invalid characters"""
-        import re
-
         # Remove invalid characters
-        filename = re.sub(r'[<>:"/\|?*]', '_', filename)
+        filename = filename.translate(INVALID_FILENAME_CHARS)
 
         # Remove leading/trailing spaces and dots
         filename = filename.strip('. ')
@@ -250,7 +315,4 @@ class FileHandler:
 
     def get_supported_formats(self) -> Dict[str, List[str]]:
         """Get supported file formats"""
-        return {
-            'text': self.supported_text_formats,
-            'document': self.supported_doc_formats
-        }
+        return self._supported_formats
@@ -0,0 +1,22 @@
+"""
+Async helpers for Cherry AI Assistant
+"""
+
+import asyncio
+import contextvars
+import functools
+from typing import Any, Callable
+
+
+async def to_thread(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable in the default executor and await its result.
+
+    Behaves like asyncio.to_thread (which needs Python 3.9+). The context is
+    always copied, but when it is empty and there are no keyword arguments the
+    callable is submitted directly, without the ctx.run partial wrapper.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    if not kwargs and not len(ctx):
+        return await loop.run_in_executor(None, func, *args)
+    return await loop.run_in_executor(None, functools.partial(ctx.run, func, *args, **kwargs))
@@ -2,14 +2,20 @@
 Logger configuration for Cherry AI Assistant
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from pathlib import Path
 from typing import Dict, Any
 
+# Background thread writing queued records to the console and log file
+_log_listener = None
+
 def setup_logging(config: Dict[str, Any] = None) -> logging.Logger:
     """Setup logging configuration for Cherry"""
+    global _log_listener
 
     if config is None:
         # Default configuration
@@ -27,6 +33,12 @@ def setup_logging(config: Dict[str, Any] = None) -> logging.Logger:
     # Configure logging
     log_level = getattr(logging, config.get('LOG_LEVEL', 'INFO').upper())
 
+    # The format has no thread, process or task fields; skip looking them up for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.logAsyncioTasks = False
+
     # Create formatter
     formatter = logging.Formatter(
         fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -45,7 +57,6 @@ def setup_logging(config: Dict[str, Any] = None) -> logging.Logger:
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
 
     # File handler with rotation
     log_file = log_dir / 'cherry.log'
@@ -56,10 +67,28 @@ def setup_logging(config: Dict[str, Any] = None) -> logging.Logger:
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+
+    # Log calls only enqueue the record; console and disk writes happen on the listener thread
+    if _log_listener is not None:
+        _log_listener.stop()
+    else:
+        atexit.register(_stop_log_listener)
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _log_listener.start()
 
     # Create Cherry logger
     cherry_logger = logging.getLogger('cherry')
     cherry_logger.info("Logging system initialized")
 
     return cherry_logger
+
+def _stop_log_listener():
+    """Flush queued records and stop the listener thread"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
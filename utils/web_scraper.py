@@ -4,17 +4,186 @@ Handles web searches and information retrieval
 """
 
 import asyncio
+import importlib.util
 import logging
+import operator
+import os
+import re
+import time
 import aiohttp
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Union
 from urllib.parse import quote_plus
-import json
 
 try:
-    from bs4 import BeautifulSoup
+    from selectolax.lexbor import LexborHTMLParser  # Optional C HTML parser, much faster than bs4
 except ImportError:
-    print("Web scraping dependencies not installed. Install with:")
-    print("pip install beautifulsoup4 aiohttp")
+    LexborHTMLParser = None
+
+try:
+    import brotli  # Lets aiohttp decode Brotli-compressed responses
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    from playwright.async_api import async_playwright  # Optional headless browser for script-rendered pages
+except ImportError:
+    async_playwright = None
+
+# Without selectolax, bs4 is imported by the parsing methods on first use, keeping it out of startup
+# and given lxml's C tree builder when installed, else the pure-Python html.parser
+BS4_PARSER = 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+
+# Connection pool limits: total, per host, and how long idle keep-alive connections are kept (s)
+CONNECTION_LIMIT = 100
+CONNECTION_LIMIT_PER_HOST = 8
+KEEPALIVE_TIMEOUT = 75
+
+# Seconds resolved host names are reused
+DNS_CACHE_TTL = 300
+
+# Request timeouts (s): whole request, and longest wait for the next bytes of a body
+REQUEST_TIMEOUT = 30
+SOCKET_READ_TIMEOUT = 10
+
+# Bytes of a page read for content extraction; far more HTML than the text kept needs
+PAGE_READ_LIMIT = 256 * 1024
+
+# Pages fetched at once by get_pages
+PAGE_FETCH_CONCURRENCY = 8
+
+# Successful search and page results kept for reuse, and for how many seconds
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_TTL = 600
+
+# Searches older than RESULT_CACHE_TTL but younger than this are answered from the
+# cache at once while a background request refreshes them
+SEARCH_STALE_TTL = 3600
+
+# Searches whose query embeddings are at least this cosine-similar share results,
+# for up to SEMANTIC_CACHE_TTL seconds, across the last SEMANTIC_CACHE_SIZE searches
+SEMANTIC_CACHE_SIMILARITY = 0.85
+SEMANTIC_CACHE_SIZE = 128
+SEMANTIC_CACHE_TTL = 3600
+
+# DuckDuckGo HTML search endpoint; the quoted query is appended
+DUCKDUCKGO_SEARCH_URL = 'https://duckduckgo.com/html/?q='
+
+# CSS selectors for DuckDuckGo result parts and for page content
+RESULT_SELECTOR = 'div.result'
+RESULT_TITLE_SELECTOR = 'a.result__a'
+RESULT_SNIPPET_SELECTOR = 'a.result__snippet'
+MAIN_CONTENT_SELECTOR = 'main, article, div.content'
+NON_TEXT_TAGS = ['script', 'style', 'noscript', 'svg', 'iframe']
+NON_TEXT_SELECTOR = ', '.join(NON_TEXT_TAGS)
+
+# Matches a class attribute containing the "result" class, as bs4 sees it while parsing (unsplit)
+RESULT_CLASS = re.compile(r'(?:^|\s)result(?:\s|$)')
+
+# Runs of whitespace collapsed to one space in extracted page text
+WHITESPACE = re.compile(r'\s+')
+
+# Characters of page text kept; longer text is cut and marked with "..."
+PAGE_TEXT_LIMIT = 5000
+
+# Pages yielding less text than this are treated as script-rendered shells and,
+# when a browser is available, rendered again in it (navigation timeout in ms)
+SCRIPT_SHELL_MAX_TEXT = 500
+BROWSER_TIMEOUT_MS = 15000
+
+# Characters of page text used in place of a missing search snippet
+SUMMARY_SNIPPET_LENGTH = 200
+
+# One pooled session shared by every WebScraper in the process, created on first use
+_shared_session = None
+_session_lock = None
+
+async def _get_shared_session(headers: Dict[str, str]) -> aiohttp.ClientSession:
+    """Return the process-wide session, creating it (and its connection pool) once"""
+    global _shared_session, _session_lock
+    if _session_lock is None:
+        _session_lock = asyncio.Lock()
+    async with _session_lock:
+        if _shared_session is None or _shared_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT
+            )
+            _shared_session = aiohttp.ClientSession(
+                connector=connector,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, sock_read=SOCKET_READ_TIMEOUT),
+                cookie_jar=aiohttp.DummyCookieJar()  # Requests stay independent; no cookies carried over
+            )
+        return _shared_session
+
+async def _close_shared_session():
+    """Close the process-wide session, if one was created"""
+    global _shared_session
+    session, _shared_session = _shared_session, None
+    if session is not None and not session.closed:
+        await session.close()
+
+def _extract_page_content_sync(html: Union[str, bytes]) -> Dict[str, str]:
+    """Title and cleaned-up main text of an HTML document (blocking; runs in the extraction pool)"""
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+
+        # Remove script, style and other non-text elements in one C-level sweep
+        tree.strip_tags(NON_TEXT_TAGS)
+
+        title_tag = tree.css_first('title')
+        title = title_tag.text().strip() if title_tag else ""
+
+        # Try to find main content areas first; one walk, first match in document order
+        main_content = tree.css_first(MAIN_CONTENT_SELECTOR)
+        root = main_content or tree.body or tree.root
+        text = root.text(separator=' ') if root else ""
+    else:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, BS4_PARSER)
+
+        # Remove script, style and other non-text elements
+        for script in soup.select(NON_TEXT_SELECTOR):
+            script.decompose()
+
+        # Extract title
+        title = ""
+        title_tag = soup.find('title')
+        if title_tag:
+            title = title_tag.get_text().strip()
+
+        # Extract main content
+        # Try to find main content areas first
+        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
+
+        # Collect text nodes only until the kept length is covered, not the whole page
+        parts = []
+        size = 0
+        for string in (main_content or soup).stripped_strings:
+            parts.append(string)
+            size += len(string) + 1
+            if size > PAGE_TEXT_LIMIT:
+                break
+        text = ' '.join(parts)
+
+    # Clean up text
+    text = WHITESPACE.sub(' ', text).strip()
+
+    # Limit text length
+    if len(text) > PAGE_TEXT_LIMIT:
+        text = text[:PAGE_TEXT_LIMIT] + "..."
+
+    return {
+        'title': title,
+        'text': text
+    }
 
 class WebScraper:
     """Handles web searches and content extraction for Cherry"""
@@ -26,9 +195,33 @@ class WebScraper:
         # Session for HTTP requests
         self.session = None
 
+        # ('search', query, max_results) or ('page', url) -> (monotonic timestamp, result)
+        self._result_cache = OrderedDict()
+
+        # Optional async query -> normalized embedding, and the searches it has seen:
+        # (monotonic timestamp, embedding, max_results, result), oldest first
+        self._embed_query = None
+        self._semantic_cache = []
+
+        # Headless browser for script-rendered pages, launched on first need and kept warm
+        self._browser_enabled = async_playwright is not None and config.get('BROWSER_FALLBACK', True)
+        self._browser_lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self._browser_context = None
+
+        # url -> future of a page fetch in progress
+        self._inflight_pages = {}
+
+        # search cache key -> background task refreshing a stale result
+        self._refresh_tasks = {}
+
+        # Worker processes for page text extraction, started on first use
+        self._extract_pool = None
+
         # Search engines
         self.search_engines = {
-            'duckduckgo': 'https://duckduckgo.com/html/?q={}',
+            'duckduckgo': DUCKDUCKGO_SEARCH_URL + '{}',
             'bing': 'https://www.bing.com/search?q={}',
         }
 
@@ -37,7 +230,7 @@ class WebScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': 'gzip, deflate, br' if brotli is not None else 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
@@ -45,64 +238,196 @@ class WebScraper:
     async def initialize(self):
         """Initialize the web scraper"""
         try:
-            self.session = aiohttp.ClientSession(
-                headers=self.headers,
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
+            self.session = await _get_shared_session(self.headers)
             self.logger.info("Web scraper initialized")
         except Exception as e:
-            self.logger.error(f"Error initializing web scraper: {e}")
+            self.logger.error("Error initializing web scraper: %s", e)
+
+    def set_query_embedder(self, embed_query: Callable[[str], Awaitable[Optional[List[float]]]]):
+        """Enable the semantic search cache with an embedder returning normalized vectors"""
+        self._embed_query = embed_query
+
+    async def _query_embedding(self, query: str) -> Optional[List[float]]:
+        """Embedding of a search query, or None when no embedder is available"""
+        if self._embed_query is None:
+            return None
+        try:
+            return await self._embed_query(query)
+        except Exception as e:
+            self.logger.debug("Query embedding unavailable: %s", e)
+            return None
+
+    def _semantic_lookup(self, embedding: List[float], max_results: int) -> Optional[Dict[str, Any]]:
+        """Result of the most similar recent search with the same max_results, if similar enough"""
+        cutoff = time.monotonic() - SEMANTIC_CACHE_TTL
+        self._semantic_cache = [entry for entry in self._semantic_cache if entry[0] > cutoff]
+
+        best_score, best_result = SEMANTIC_CACHE_SIMILARITY, None
+        for _, cached_embedding, cached_max_results, result in self._semantic_cache:
+            if cached_max_results != max_results:
+                continue
+            # Embeddings are normalized, so the dot product is the cosine similarity
+            score = sum(map(operator.mul, embedding, cached_embedding))
+            if score >= best_score:
+                best_score, best_result = score, result
+        return best_result
+
+    def _semantic_store(self, embedding: List[float], max_results: int, result: Dict[str, Any]):
+        """Remember a search result under its query embedding"""
+        self._semantic_cache.append((time.monotonic(), embedding, max_results, result))
+        if len(self._semantic_cache) > SEMANTIC_CACHE_SIZE:
+            del self._semantic_cache[0]
+
+    def _cached_entry(self, key: tuple, max_age: float = RESULT_CACHE_TTL) -> Optional[tuple]:
+        """(timestamp, result) of a cached result younger than max_age seconds, or None"""
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= max_age:
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        return entry
+
+    def _cached_result(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """A cached result younger than RESULT_CACHE_TTL, or None"""
+        entry = self._cached_entry(key)
+        return entry[1] if entry is not None else None
+
+    def _cache_result(self, key: tuple, result: Dict[str, Any]):
+        """Store a result, evicting the least recently used entry when full"""
+        self._result_cache[key] = (time.monotonic(), result)
+        self._result_cache.move_to_end(key)
+        if len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+
+    @staticmethod
+    def _copy_search_result(result: Dict[str, Any], **changes) -> Dict[str, Any]:
+        """Copy of a search result down to each result dict, so callers can't edit a cached one"""
+        return {**result, 'results': [dict(item) for item in result['results']], **changes}
 
     async def search(self, query: str, max_results: int = 5) -> Dict[str, Any]:
         """Search for information on the web"""
+        cache_key = ('search', query, max_results)
+        entry = self._cached_entry(cache_key, SEARCH_STALE_TTL)
+        if entry is not None:
+            stored_at, cached = entry
+            if time.monotonic() - stored_at >= RESULT_CACHE_TTL and cache_key not in self._refresh_tasks:
+                # Answer with the stale results now; fresh ones replace them in the cache
+                task = asyncio.create_task(self._search_remote(query, max_results))
+                self._refresh_tasks[cache_key] = task
+                task.add_done_callback(lambda _: self._refresh_tasks.pop(cache_key, None))
+            return self._copy_search_result(cached)
+
+        # A paraphrase of a recent query gets that query's results
+        embedding = await self._query_embedding(query)
+        if embedding is not None:
+            similar = self._semantic_lookup(embedding, max_results)
+            if similar is not None:
+                self.logger.info("Reusing results of similar search '%s' for: %s", similar['query'], query)
+                # Own copies for this query's cache entry and for the caller; none shared with the original
+                similar = self._copy_search_result(similar, query=query)
+                self._cache_result(cache_key, similar)
+                return self._copy_search_result(similar)
+
+        return await self._search_remote(query, max_results, embedding)
+
+    async def _search_remote(self, query: str, max_results: int, embedding: Optional[List[float]] = None) -> Dict[str, Any]:
+        """Run a search against DuckDuckGo and cache a successful result"""
         try:
-            if not self.session:
+            if not self.session or self.session.closed:
                 await self.initialize()
 
-            self.logger.info(f"Searching web for: {query}")
+            self.logger.info("Searching web for: %s", query)
 
             # Use DuckDuckGo for privacy-friendly search
-            search_url = self.search_engines['duckduckgo'].format(quote_plus(query))
+            search_url = DUCKDUCKGO_SEARCH_URL + quote_plus(query)
 
             async with self.session.get(search_url) as response:
                 if response.status == 200:
-                    html = await response.text()
+                    html = await self._read_html(response)
                     results = await self._parse_duckduckgo_results(html, max_results)
 
-                    return {
+                    search_results = {
                         'query': query,
                         'results': results,
                         'total_results': len(results)
                     }
+                    self._cache_result(('search', query, max_results), search_results)
+                    if embedding is not None:
+                        self._semantic_store(embedding, max_results, search_results)
+                    return self._copy_search_result(search_results)
                 else:
-                    self.logger.error(f"Search request failed: {response.status}")
+                    self.logger.error("Search request failed: %s", response.status)
                     return {'query': query, 'results': [], 'error': f'HTTP {response.status}'}
 
         except Exception as e:
-            self.logger.error(f"Error searching web: {e}")
+            self.logger.error("Error searching web: %s", e)
             return {'query': query, 'results': [], 'error': str(e)}
 
-    async def _parse_duckduckgo_results(self, html: str, max_results: int) -> List[Dict[str, str]]:
+    @staticmethod
+    async def _read_html(response: aiohttp.ClientResponse, limit: Optional[int] = None) -> Union[str, bytes]:
+        """Response body for the HTML parsers, at most limit bytes, left undecoded whenever they can take the bytes"""
+        if limit is None:
+            raw = await response.read()
+        else:
+            # Stop reading once enough HTML has arrived; both parsers accept a truncated document
+            chunks, size = [], 0
+            async for chunk in response.content.iter_any():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= limit:
+                    break
+            raw = b''.join(chunks)[:limit]
+        # bs4 sniffs the encoding itself; Lexbor reads bytes as UTF-8. Only a declared
+        # charset is honoured: get_encoding() cannot sniff a body read as a stream
+        charset = (response.charset or '').lower()
+        if LexborHTMLParser is None or not charset or charset in ('utf-8', 'utf8'):
+            return raw
+        try:
+            return raw.decode(charset, errors='replace')
+        except LookupError:
+            return raw.decode('utf-8', errors='replace')
+
+    async def _parse_duckduckgo_results(self, html: Union[str, bytes], max_results: int) -> List[Dict[str, str]]:
         """Parse DuckDuckGo search results"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            if LexborHTMLParser is not None:
+                tree = LexborHTMLParser(html)
+                result_containers = tree.css(RESULT_SELECTOR)
+
+                # One whole-document query per field; valid when every result has one title and one snippet
+                titles = tree.css(f'{RESULT_SELECTOR} {RESULT_TITLE_SELECTOR}')
+                snippets = tree.css(f'{RESULT_SELECTOR} {RESULT_SNIPPET_SELECTOR}')
+                if len(titles) == len(snippets) == len(result_containers):
+                    results = []
+                    for title_elem, snippet_elem in zip(titles[:max_results], snippets[:max_results]):
+                        title = title_elem.text().strip()
+                        url = title_elem.attributes.get('href')
+                        if title and url:
+                            results.append({'title': title, 'url': url, 'snippet': snippet_elem.text().strip()})
+                    return results
+            else:
+                from bs4 import BeautifulSoup, SoupStrainer
+                # Build only the result containers; the rest of the page is never materialized
+                soup = BeautifulSoup(html, BS4_PARSER, parse_only=SoupStrainer('div', class_=RESULT_CLASS))
+                result_containers = soup.find_all('div', class_='result')
             results = []
 
-            # Find result containers
-            result_containers = soup.find_all('div', class_='result')
-
             for container in result_containers[:max_results]:
                 try:
-                    # Extract title
-                    title_elem = container.find('a', class_='result__a')
-                    title = title_elem.get_text().strip() if title_elem else "No title"
-
-                    # Extract URL
-                    url = title_elem.get('href') if title_elem else ""
-
-                    # Extract snippet
-                    snippet_elem = container.find('a', class_='result__snippet')
-                    snippet = snippet_elem.get_text().strip() if snippet_elem else ""
+                    if LexborHTMLParser is not None:
+                        title_elem = container.css_first(RESULT_TITLE_SELECTOR)
+                        snippet_elem = container.css_first(RESULT_SNIPPET_SELECTOR)
+                        title = title_elem.text().strip() if title_elem else "No title"
+                        url = title_elem.attributes.get('href') if title_elem else ""
+                        snippet = snippet_elem.text().strip() if snippet_elem else ""
+                    else:
+                        title_elem = container.select_one(RESULT_TITLE_SELECTOR)
+                        snippet_elem = container.select_one(RESULT_SNIPPET_SELECTOR)
+                        title = title_elem.get_text().strip() if title_elem else "No title"
+                        url = title_elem.get('href') if title_elem else ""
+                        snippet = snippet_elem.get_text().strip() if snippet_elem else ""
 
                     if title and url:
                         results.append({
@@ -112,87 +437,126 @@ class WebScraper:
                         })
 
                 except Exception as e:
-                    self.logger.warning(f"Error parsing result container: {e}")
+                    self.logger.warning("Error parsing result container: %s", e)
                     continue
 
             return results
 
         except Exception as e:
-            self.logger.error(f"Error parsing search results: {e}")
+            self.logger.error("Error parsing search results: %s", e)
             return []
 
     async def get_page_content(self, url: str) -> Dict[str, Any]:
         """Get content from a web page"""
+        cached = self._cached_result(('page', url))
+        if cached is not None:
+            return cached
+
+        # Concurrent requests for the same page share one fetch
+        fetch = self._inflight_pages.get(url)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_page_content(url))
+            self._inflight_pages[url] = fetch
+            fetch.add_done_callback(lambda _: self._inflight_pages.pop(url, None))
+        # Shielded so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(fetch)
+
+    async def _fetch_page_content(self, url: str) -> Dict[str, Any]:
+        """Download and extract a page, caching a successful result"""
         try:
-            if not self.session:
+            if not self.session or self.session.closed:
                 await self.initialize()
 
             async with self.session.get(url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    content = await self._extract_page_content(html)
-
-                    return {
-                        'url': url,
-                        'title': content.get('title', ''),
-                        'text': content.get('text', ''),
-                        'success': True
-                    }
-                else:
+                if response.status != 200:
                     return {
                         'url': url,
                         'success': False,
                         'error': f'HTTP {response.status}'
                     }
+                html = await self._read_html(response, PAGE_READ_LIMIT)
+
+            content = await self._extract_page_content(html)
+            if self._browser_enabled and len(content.get('text', '')) < SCRIPT_SHELL_MAX_TEXT:
+                # Probably an empty shell filled in by scripts; let a real browser run them
+                rendered = await self._render_with_browser(url)
+                if rendered:
+                    content = await self._extract_page_content(rendered)
+
+            page = {
+                'url': url,
+                'title': content.get('title', ''),
+                'text': content.get('text', ''),
+                'success': True
+            }
+            self._cache_result(('page', url), page)
+            return page
 
         except Exception as e:
-            self.logger.error(f"Error getting page content: {e}")
+            self.logger.error("Error getting page content: %s", e)
             return {
                 'url': url,
                 'success': False,
                 'error': str(e)
             }
 
-    async def _extract_page_content(self, html: str) -> Dict[str, str]:
-        """Extract text content from HTML"""
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+    async def get_pages(self, urls: List[str], max_concurrency: int = PAGE_FETCH_CONCURRENCY) -> List[Dict[str, Any]]:
+        """Fetch several pages concurrently; results are in the order of urls"""
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-            # Extract title
-            title = ""
-            title_tag = soup.find('title')
-            if title_tag:
-                title = title_tag.get_text().strip()
+        async def fetch(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_page_content(url)
 
-            # Extract main content
-            # Try to find main content areas first
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
+        # get_page_content reports failures in its result rather than raising
+        return await asyncio.gather(*(fetch(url) for url in urls))
 
-            if main_content:
-                text = main_content.get_text()
-            else:
-                text = soup.get_text()
-
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-
-            # Limit text length
-            if len(text) > 5000:
-                text = text[:5000] + "..."
+    async def _render_with_browser(self, url: str) -> Optional[str]:
+        """HTML of a page after its scripts ran, from a headless browser shared across calls"""
+        async with self._browser_lock:
+            if self._browser_context is None:
+                try:
+                    self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(headless=True)
+                    self._browser_context = await self._browser.new_context(user_agent=self.headers['User-Agent'])
+                except Exception as e:
+                    self.logger.warning("Headless browser unavailable, not retrying: %s", e)
+                    self._browser_enabled = False
+                    try:
+                        await self._close_browser()
+                    except Exception:
+                        self._playwright = self._browser = self._browser_context = None
+                    return None
 
-            return {
-                'title': title,
-                'text': text
-            }
+        try:
+            page = await self._browser_context.new_page()
+            try:
+                await page.goto(url, wait_until='domcontentloaded', timeout=BROWSER_TIMEOUT_MS)
+                return await page.content()
+            finally:
+                await page.close()
+        except Exception as e:
+            self.logger.warning("Error rendering %s in browser: %s", url, e)
+            return None
+
+    async def _close_browser(self):
+        """Shut down the headless browser and its driver, if started"""
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._playwright = self._browser = self._browser_context = None
+
+    async def _extract_page_content(self, html: Union[str, bytes]) -> Dict[str, str]:
+        """Extract text content from HTML"""
+        try:
+            # Parsing holds the GIL; worker processes keep it off the event loop and let pages parse in parallel
+            if self._extract_pool is None:
+                self._extract_pool = ProcessPoolExecutor(max_workers=min(PAGE_FETCH_CONCURRENCY, os.cpu_count() or 1))
+            return await asyncio.get_running_loop().run_in_executor(self._extract_pool, _extract_page_content_sync, html)
 
         except Exception as e:
-            self.logger.error(f"Error extracting page content: {e}")
+            self.logger.error("Error extracting page content: %s", e)
             return {'title': '', 'text': ''}
 
     async def quick_search_summary(self, query: str) -> str:
@@ -200,10 +564,21 @@ class WebScraper:
         try:
             search_results = await self.search(query, max_results=3)
 
-            if search_results['results']:
+            results = search_results['results']
+            if results:
+                # Fill in missing snippets from the pages themselves, fetched together
+                bare = [result['url'] for result in results if not result['snippet']]
+                if bare:
+                    pages = dict(zip(bare, await self.get_pages(bare)))
+                    results = [
+                        dict(result, snippet=pages[result['url']]['text'][:SUMMARY_SNIPPET_LENGTH])
+                        if not result['snippet'] and pages[result['url']].get('success') else result
+                        for result in results
+                    ]
+
                 summary_parts = [f"Search results for '{query}':"]
 
-                for i, result in enumerate(search_results['results'], 1):
+                for i, result in enumerate(results, 1):
                     summary_parts.append(f"{i}. {result['title']}")
                     if result['snippet']:
                         summary_parts.append(f"   {result['snippet']}")
@@ -213,14 +588,20 @@ class WebScraper:
                 return f"No search results found for '{query}'"
 
         except Exception as e:
-            self.logger.error(f"Error getting search summary: {e}")
+            self.logger.error("Error getting search summary: %s", e)
             return f"Error searching for '{query}': {str(e)}"
 
     async def cleanup(self):
         """Cleanup web scraper resources"""
         try:
-            if self.session:
-                await self.session.close()
+            for task in list(self._refresh_tasks.values()):
+                task.cancel()
+            self.session = None
+            await _close_shared_session()
+            await self._close_browser()
+            if self._extract_pool is not None:
+                self._extract_pool.shutdown(wait=False)
+                self._extract_pool = None
             self.logger.info("Web scraper cleanup completed")
         except Exception as e:
-            self.logger.error(f"Error during web scraper cleanup: {e}")
+            self.logger.error("Error during web scraper cleanup: %s", e)